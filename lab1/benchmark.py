@@ -0,0 +1,347 @@
+"""Сравнительные замеры ООП (lab1/oop) и функциональных (lab1/no_oop.py) очередей и стеков.
+
+Пример:
+    python benchmark.py --sizes 10 1000 100000 --output run.json
+    python benchmark.py --baseline run.json --threshold 0.15
+"""
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import no_oop  # noqa: E402
+
+
+def _load_oop() -> Any:
+    """Загрузить lab1/oop (файл без расширения .py)"""
+    loader = importlib.machinery.SourceFileLoader('lab1_oop', os.path.join(HERE, 'oop'))
+    spec = importlib.util.spec_from_loader('lab1_oop', loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+oop = _load_oop()
+
+BATCH = 1000
+LATENCY_SAMPLES = 10000
+# Метрики, по которым ищется регрессия: имя -> True, если больше - лучше
+TRACKED_METRICS = {'ops_per_sec': True, 'p99_ns': False, 'peak_bytes': False}
+
+# Операция получает размер n и возвращает (функцию одного шага, число шагов,
+# число элементов за все шаги). Подготовка (заполнение контейнера) не замеряется.
+Case = Callable[[int], Tuple[Callable[[], Any], int, int]]
+
+
+def _batched(n: int, make: Callable[[int], Any],
+             move: Callable[[Any], Any]) -> Tuple[Callable[[], Any], int, int]:
+    """Пакетная операция над ровно n элементами: шаги по min(BATCH, n) и шаг с остатком.
+
+    make(size) готовит аргумент шага заранее, move(аргумент) - сам замеряемый шаг.
+    """
+    batch = max(1, min(BATCH, n))
+    sizes = [batch] * (n // batch)
+    if n % batch:
+        sizes.append(n % batch)
+    arguments = {size: make(size) for size in set(sizes)}
+    pending = iter([arguments[size] for size in sizes])
+    return lambda: move(next(pending)), len(sizes), n
+
+
+def _filled_queue(n: int) -> Any:
+    queue = oop.Queue()
+    queue.enqueue_many(range(n))
+    return queue
+
+
+def _filled_stack(n: int) -> Any:
+    stack = oop.Stack()
+    for i in range(n):
+        stack.push(i)
+    return stack
+
+
+def _filled_typed(factory: Callable[[str], Any], n: int) -> Any:
+    container = factory('d')
+    container.extend(range(n))
+    return container
+
+
+def _oop_cases() -> Dict[str, Case]:
+    def enqueue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = oop.Queue()
+        return lambda: queue.enqueue(1), n, n
+
+    def dequeue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        return _filled_queue(n).dequeue, n, n
+
+    def enqueue_many(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = oop.Queue()
+        return _batched(n, lambda size: list(range(size)), queue.enqueue_many)
+
+    def dequeue_many(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = _filled_queue(n)
+        return _batched(n, lambda size: size, queue.dequeue_many)
+
+    def push(n: int) -> Tuple[Callable[[], Any], int, int]:
+        stack = oop.Stack()
+        return lambda: stack.push(1), n, n
+
+    def pop(n: int) -> Tuple[Callable[[], Any], int, int]:
+        return _filled_stack(n).pop, n, n
+
+    return {
+        'oop.Queue.enqueue': enqueue,
+        'oop.Queue.dequeue': dequeue,
+        'oop.Queue.enqueue_many': enqueue_many,
+        'oop.Queue.dequeue_many': dequeue_many,
+        'oop.Stack.push': push,
+        'oop.Stack.pop': pop,
+    }
+
+
+def _typed_cases() -> Dict[str, Case]:
+    def enqueue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = oop.Queue.typed('d')
+        return lambda: queue.enqueue(1.0), n, n
+
+    def dequeue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        return _filled_typed(oop.Queue.typed, n).dequeue, n, n
+
+    def extend(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = oop.Queue.typed('d')
+        return _batched(n, lambda size: array('d', range(size)), queue.extend)
+
+    def dequeue_many(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = _filled_typed(oop.Queue.typed, n)
+        return _batched(n, lambda size: size, queue.dequeue_many)
+
+    def push(n: int) -> Tuple[Callable[[], Any], int, int]:
+        stack = oop.Stack.typed('d')
+        return lambda: stack.push(1.0), n, n
+
+    def pop(n: int) -> Tuple[Callable[[], Any], int, int]:
+        return _filled_typed(oop.Stack.typed, n).pop, n, n
+
+    def pop_many(n: int) -> Tuple[Callable[[], Any], int, int]:
+        stack = _filled_typed(oop.Stack.typed, n)
+        return _batched(n, lambda size: size, stack.pop_many)
+
+    return {
+        'oop.TypedQueue.enqueue': enqueue,
+        'oop.TypedQueue.dequeue': dequeue,
+        'oop.TypedQueue.extend': extend,
+        'oop.TypedQueue.dequeue_many': dequeue_many,
+        'oop.TypedStack.push': push,
+        'oop.TypedStack.pop': pop,
+        'oop.TypedStack.pop_many': pop_many,
+    }
+
+
+def _functional_cases() -> Dict[str, Case]:
+    """Функциональные операции: состояние передаётся через замыкание"""
+    def threaded(initial: Any, step: Callable[[Any], Any]) -> Callable[[], Any]:
+        state = [initial]
+
+        def run() -> None:
+            state[0] = step(state[0])
+        return run
+
+    def fill(create: Callable[[], Any], add: Callable[[Any, int], Any], n: int) -> Any:
+        container = create()
+        for i in range(n):
+            container = add(container, i)
+        return container
+
+    def enqueue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        return threaded(no_oop.create_queue(), lambda q: no_oop.enqueue(q, 1)), n, n
+
+    def dequeue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = fill(no_oop.create_queue, no_oop.enqueue, n)
+        return threaded(queue, lambda q: no_oop.dequeue(q)[1]), n, n
+
+    def push(n: int) -> Tuple[Callable[[], Any], int, int]:
+        return threaded(no_oop.create_stack(), lambda s: no_oop.push(s, 1)), n, n
+
+    def pop(n: int) -> Tuple[Callable[[], Any], int, int]:
+        stack = fill(no_oop.create_stack, no_oop.push, n)
+        return threaded(stack, lambda s: no_oop.pop(s)[1]), n, n
+
+    def p_enqueue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = no_oop.create_persistent_queue()
+        return threaded(queue, lambda q: no_oop.persistent_enqueue(q, 1)), n, n
+
+    def p_dequeue(n: int) -> Tuple[Callable[[], Any], int, int]:
+        queue = fill(no_oop.create_persistent_queue, no_oop.persistent_enqueue, n)
+        return threaded(queue, lambda q: no_oop.persistent_dequeue(q)[1]), n, n
+
+    def p_push(n: int) -> Tuple[Callable[[], Any], int, int]:
+        stack = no_oop.create_persistent_stack()
+        return threaded(stack, lambda s: no_oop.persistent_push(s, 1)), n, n
+
+    def p_pop(n: int) -> Tuple[Callable[[], Any], int, int]:
+        stack = fill(no_oop.create_persistent_stack, no_oop.persistent_push, n)
+        return threaded(stack, lambda s: no_oop.persistent_pop(s)[1]), n, n
+
+    return {
+        'no_oop.enqueue': enqueue,
+        'no_oop.dequeue': dequeue,
+        'no_oop.push': push,
+        'no_oop.pop': pop,
+        'no_oop.persistent_enqueue': p_enqueue,
+        'no_oop.persistent_dequeue': p_dequeue,
+        'no_oop.persistent_push': p_push,
+        'no_oop.persistent_pop': p_pop,
+    }
+
+
+# Списочные функциональные операции копируют весь список: O(n^2) на n шагов
+QUADRATIC = {'no_oop.enqueue', 'no_oop.dequeue', 'no_oop.push', 'no_oop.pop'}
+
+
+def all_cases() -> Dict[str, Case]:
+    cases: Dict[str, Case] = {}
+    cases.update(_oop_cases())
+    cases.update(_typed_cases())
+    cases.update(_functional_cases())
+    return cases
+
+
+def _percentile(samples: List[int], fraction: float) -> int:
+    index = min(len(samples) - 1, int(fraction * len(samples)))
+    return samples[index]
+
+
+def measure(case: Case, n: int, track_memory: bool) -> Dict[str, Any]:
+    """Замерить один случай: пропускная способность, задержки и пик памяти"""
+    step, steps, items = case(n)
+    stride = max(1, steps // LATENCY_SAMPLES)
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for i in range(steps):
+        if i % stride:
+            step()
+        else:
+            t0 = clock()
+            step()
+            latencies.append(clock() - t0)
+    elapsed = max(clock() - start, 1)
+    latencies.sort()
+    result = {
+        'ops_per_sec': items / (elapsed / 1e9),
+        'items': items,
+        'p50_ns': _percentile(latencies, 0.50),
+        'p90_ns': _percentile(latencies, 0.90),
+        'p99_ns': _percentile(latencies, 0.99),
+        'max_ns': latencies[-1],
+        'peak_bytes': None,
+    }
+    if track_memory:
+        # Отдельный прогон: tracemalloc заметно замедляет код
+        tracemalloc.start()
+        try:
+            step, steps, _ = case(n)
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            for _ in range(steps):
+                step()
+            result['peak_bytes'] = tracemalloc.get_traced_memory()[1] - base
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run(sizes: List[int], selected: Optional[List[str]], quadratic_limit: int,
+        track_memory: bool) -> Dict[str, Any]:
+    cases = all_cases()
+    names = selected or sorted(cases)
+    unknown = [name for name in names if name not in cases]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {', '.join(unknown)}")
+    results = {}
+    for name in names:
+        for n in sizes:
+            if name in QUADRATIC and n > quadratic_limit:
+                continue
+            key = f"{name}@{n}"
+            results[key] = measure(cases[name], n, track_memory)
+            print(f"{key:45s} {results[key]['ops_per_sec']:14,.0f} оп/с  "
+                  f"p99={results[key]['p99_ns']} нс", flush=True)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'batch': BATCH,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Найти метрики, ухудшившиеся относительно baseline больше чем на threshold"""
+    regressions = []
+    for key, metrics in current['results'].items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        for metric, higher_is_better in TRACKED_METRICS.items():
+            before, after = old.get(metric), metrics.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{key} {metric}: {before:,.0f} -> {after:,.0f} ({change:+.1%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры очередей и стеков lab1")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10 ** 4, 10 ** 5],
+                        help="размеры контейнеров (до 10^7)")
+    parser.add_argument('--cases', nargs='+', help="имена случаев (по умолчанию все)")
+    parser.add_argument('--list', action='store_true', help="показать доступные случаи")
+    parser.add_argument('--quadratic-limit', type=int, default=10 ** 4,
+                        help="максимальный размер для O(n^2) списочных функций")
+    parser.add_argument('--no-memory', action='store_true', help="не замерять пик памяти")
+    parser.add_argument('--output', help="куда записать результаты в JSON")
+    parser.add_argument('--baseline', help="JSON предыдущего прогона для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="допустимое ухудшение метрики (доля, по умолчанию 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print('\n'.join(sorted(all_cases())))
+        return 0
+
+    report = run(args.sizes, args.cases, args.quadratic_limit, not args.no_memory)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("\nРегрессии:")
+            print('\n'.join(regressions))
+            return 1
+        print("\nРегрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
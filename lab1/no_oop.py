@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, List, Optional, Tuple
+from typing import Generic, TypeVar, List, Optional, Tuple, Any
 
 T = TypeVar('T')
 
@@ -67,6 +67,134 @@ def stack_size(stack: List[T]) -> int:
     return len(stack)
 
 
+# Персистентный стек: односвязный список (cons-ячейки) с общими хвостами.
+# Пустой стек - None, непустой - кортеж (верхний элемент, остаток, размер).
+PersistentStack = Optional[Tuple[Any, Any, int]]
+
+
+def create_persistent_stack() -> PersistentStack:
+    """Создать пустой персистентный стек"""
+    return None
+
+
+def persistent_push(stack: PersistentStack, item: T) -> PersistentStack:
+    """Добавить элемент за O(1): новый стек разделяет хвост со старым"""
+    return item, stack, persistent_stack_size(stack) + 1
+
+
+def persistent_pop(stack: PersistentStack) -> Tuple[Optional[T], PersistentStack]:
+    """Удалить и вернуть верхний элемент + стек без него за O(1)"""
+    if stack is None:
+        return None, stack
+    item, rest, _ = stack
+    return item, rest
+
+
+def is_persistent_stack_empty(stack: PersistentStack) -> bool:
+    """Проверить пустоту персистентного стека"""
+    return stack is None
+
+
+def persistent_stack_size(stack: PersistentStack) -> int:
+    """Вернуть размер персистентного стека"""
+    return stack[2] if stack is not None else 0
+
+
+def persistent_stack_to_list(stack: PersistentStack) -> List[T]:
+    """Элементы стека от дна к вершине (как у списочного стека)"""
+    items = []
+    while stack is not None:
+        items.append(stack[0])
+        stack = stack[1]
+    items.reverse()
+    return items
+
+
+# Персистентная очередь реального времени (Окасаки): ленивый поток головы,
+# список хвоста в обратном порядке и расписание, которое на каждой операции
+# вычисляет ещё одну ячейку головы. Каждая операция - O(1) в худшем случае,
+# поэтому старые версии можно использовать повторно без потери сложности.
+# Ленивая ячейка - список [вычислена?, значение или функция], значение -
+# None (конец потока) или кортеж (элемент, следующая ленивая ячейка).
+PersistentQueue = Tuple[int, list, Any, list]
+
+_EMPTY_STREAM: list = [True, None]
+
+
+def _force(suspension: list) -> Optional[Tuple[Any, list]]:
+    if not suspension[0]:
+        suspension[1] = suspension[1]()
+        suspension[0] = True
+    return suspension[1]
+
+
+def _rotate(front: list, rear: Any, acc: list) -> list:
+    """Лениво вычислить front ++ reversed(rear) ++ acc по одной ячейке"""
+    def step() -> Tuple[Any, list]:
+        cell = _force(front)
+        rear_item, rear_rest = rear
+        if cell is None:
+            return rear_item, acc
+        item, front_rest = cell
+        return item, _rotate(front_rest, rear_rest, [True, (rear_item, acc)])
+    return [False, step]
+
+
+def _exec(size: int, front: list, rear: Any, schedule: list) -> PersistentQueue:
+    cell = _force(schedule)
+    if cell is not None:
+        return size, front, rear, cell[1]
+    front = _rotate(front, rear, _EMPTY_STREAM)
+    return size, front, None, front
+
+
+def create_persistent_queue() -> PersistentQueue:
+    """Создать пустую персистентную очередь"""
+    return 0, _EMPTY_STREAM, None, _EMPTY_STREAM
+
+
+def persistent_enqueue(queue: PersistentQueue, item: T) -> PersistentQueue:
+    """Добавить элемент за O(1) и вернуть новую очередь"""
+    size, front, rear, schedule = queue
+    return _exec(size + 1, front, (item, rear), schedule)
+
+
+def persistent_dequeue(queue: PersistentQueue) -> Tuple[Optional[T], PersistentQueue]:
+    """Удалить и вернуть первый элемент + новую очередь за O(1)"""
+    size, front, rear, schedule = queue
+    cell = _force(front)
+    if cell is None:
+        return None, queue
+    item, front_rest = cell
+    return item, _exec(size - 1, front_rest, rear, schedule)
+
+
+def is_persistent_queue_empty(queue: PersistentQueue) -> bool:
+    """Проверить пустоту персистентной очереди"""
+    return queue[0] == 0
+
+
+def persistent_queue_size(queue: PersistentQueue) -> int:
+    """Вернуть размер персистентной очереди"""
+    return queue[0]
+
+
+def persistent_queue_to_list(queue: PersistentQueue) -> List[T]:
+    """Элементы очереди от первого к последнему"""
+    _, front, rear, _ = queue
+    items = []
+    cell = _force(front)
+    while cell is not None:
+        items.append(cell[0])
+        cell = _force(cell[1])
+    tail = []
+    while rear is not None:
+        tail.append(rear[0])
+        rear = rear[1]
+    items.extend(reversed(tail))
+    return items
+
+
 # Демонстрация работы
 if __name__ == "__main__":
     print("=== функциональная реализация ===")
@@ -111,3 +239,19 @@ if __name__ == "__main__":
     print(f"Извлеченный элемент: {popped2}")
     print(f"Стек после pop: {s}")
 
+    # Персистентные версии: старые версии остаются валидными
+    print("\n--- Персистентные Queue и Stack ---")
+    pq = create_persistent_queue()
+    for value in (10, 20, 30):
+        pq = persistent_enqueue(pq, value)
+    old_pq = pq
+    item, pq = persistent_dequeue(pq)
+    print(f"Извлеченный элемент: {item}")
+    print(f"Новая очередь: {persistent_queue_to_list(pq)}, старая: {persistent_queue_to_list(old_pq)}")
+
+    ps = create_persistent_stack()
+    for value in ("A", "B", "C"):
+        ps = persistent_push(ps, value)
+    popped, rest = persistent_pop(ps)
+    print(f"Извлеченный элемент: {popped}")
+    print(f"Новый стек: {persistent_stack_to_list(rest)}, старый: {persistent_stack_to_list(ps)}")
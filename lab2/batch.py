@@ -0,0 +1,180 @@
+from array import array
+from itertools import chain, repeat
+from numbers import Number
+from operator import add, mul
+from typing import Iterable, Iterator, List, Union
+
+from oop import Matrix
+
+
+class MatrixBatch:
+    """Пакет из count матриц одной формы rows x cols в одном массиве array('d')
+
+    Матрица k занимает элементы [k * size, (k + 1) * size), где size = rows * cols,
+    и хранится построчно. Операции выполняются сразу над всем пакетом:
+    элемент (i, j) всех матриц - это срез data[i * cols + j::size].
+    """
+
+    __slots__ = ('count', 'rows', 'cols', '_data')
+
+    def __init__(self, matrices: Iterable[Matrix]) -> None:
+        matrices = list(matrices)
+        if not matrices:
+            raise ValueError("MatrixBatch needs at least one matrix")
+        self.rows = matrices[0].rows
+        self.cols = matrices[0].cols
+        self.count = len(matrices)
+        self._data = array('d')
+        for matrix in matrices:
+            if matrix.rows != self.rows or matrix.cols != self.cols:
+                raise ValueError(f"All matrices must be {self.rows}x{self.cols}, got {matrix.rows}x{matrix.cols}")
+            self._data.frombytes(memoryview(matrix._row_major()).cast('B'))
+
+    @classmethod
+    def _from_flat(cls, count: int, rows: int, cols: int, data: array) -> 'MatrixBatch':
+        """Создать пакет поверх готового массива без проверок и копирования"""
+        batch = cls.__new__(cls)
+        batch.count = count
+        batch.rows = rows
+        batch.cols = cols
+        batch._data = data
+        return batch
+
+    def _components(self) -> List[array]:
+        """Срезы по позициям: components[i * cols + j] - элементы (i, j) всех матриц"""
+        size = self.rows * self.cols
+        return [self._data[p::size] for p in range(size)]
+
+    def _operand(self, other: Union['MatrixBatch', Matrix]) -> array:
+        """Данные второго операнда; одиночная Matrix повторяется для каждой матрицы пакета"""
+        if isinstance(other, MatrixBatch):
+            if other.count != self.count:
+                raise ValueError(f"Batches must have the same size, got {self.count} and {other.count}")
+            return other._data
+        # Матрица из Matrix.open() хранит memoryview, поэтому сначала копируем в array
+        return array('d', other._row_major()) * self.count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, k: int) -> Matrix:
+        if not -self.count <= k < self.count:
+            raise IndexError(f"Batch index {k} is out of range for {self.count} matrices")
+        size = self.rows * self.cols
+        start = (k % self.count) * size
+        return Matrix._from_flat(self.rows, self.cols, self._data[start:start + size])
+
+    def __iter__(self) -> Iterator[Matrix]:
+        return iter(self.to_matrices())
+
+    def to_matrices(self) -> List[Matrix]:
+        """Разобрать пакет обратно на отдельные Matrix"""
+        return [self[k] for k in range(self.count)]
+
+    def to_list(self) -> List[List[List[float]]]:
+        """Экспорт во вложенные списки"""
+        return [matrix.to_list() for matrix in self.to_matrices()]
+
+    def __add__(self, other: Union['MatrixBatch', Matrix]) -> 'MatrixBatch':
+        """Поэлементное сложение с пакетом или одной матрицей (прибавляется к каждой)"""
+        if not isinstance(other, (MatrixBatch, Matrix)):
+            return NotImplemented
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        values = array('d', map(add, self._data, self._operand(other)))
+        return MatrixBatch._from_flat(self.count, self.rows, self.cols, values)
+
+    __radd__ = __add__
+
+    def __mul__(self, other: Union['MatrixBatch', Matrix, Number]) -> 'MatrixBatch':
+        """Умножение на скаляр или попарное произведение с пакетом (одной матрицей)"""
+        if isinstance(other, Number):
+            values = array('d', map(mul, self._data, repeat(other)))
+            return MatrixBatch._from_flat(self.count, self.rows, self.cols, values)
+        if not isinstance(other, (MatrixBatch, Matrix)):
+            return NotImplemented
+        if self.cols != other.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second")
+        right = other if isinstance(other, MatrixBatch) else MatrixBatch._from_flat(
+            self.count, other.rows, other.cols, self._operand(other))
+        values = _batch_matmul(self._components(), right._components(), self.rows, self.cols, other.cols, self.count)
+        return MatrixBatch._from_flat(self.count, self.rows, other.cols, values)
+
+    def __rmul__(self, other: Union[Matrix, Number]) -> 'MatrixBatch':
+        """Умножение скаляра или одной матрицы слева на каждую матрицу пакета"""
+        if isinstance(other, Number):
+            return self * other
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if other.cols != self.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second")
+        left = MatrixBatch._from_flat(self.count, other.rows, other.cols, self._operand(other))
+        values = _batch_matmul(left._components(), self._components(), other.rows, self.rows, self.cols, self.count)
+        return MatrixBatch._from_flat(self.count, other.rows, self.cols, values)
+
+    def transpose(self) -> 'MatrixBatch':
+        """Транспонирование всех матриц: перестановка срезов по позициям"""
+        parts = self._components()
+        order = [parts[j * self.cols + i] for i in range(self.cols) for j in range(self.rows)]
+        return MatrixBatch._from_flat(self.count, self.cols, self.rows, _interleave(order))
+
+    def determinant(self) -> array:
+        """Определители всех матриц: формулы для n = 1, 2, 3 за один проход, иначе LU"""
+        if self.rows != self.cols:
+            raise ValueError("Determinant is defined only for square matrices")
+        n = self.rows
+        # zip(*[iter(data)] * size) отдаёт элементы матриц кортежами по одной
+        matrices = zip(*[iter(self._data)] * (n * n))
+        if n == 1:
+            return array('d', self._data)
+        elif n == 2:
+            return array('d', (a * d - b * c for a, b, c, d in matrices))
+        elif n == 3:
+            # Правило Саррюса для матрицы 3x3
+            return array('d', (a * f * k + b * g * h + c * e * i - c * f * h - b * e * k - a * g * i
+                               for a, b, c, e, f, g, h, i, k in matrices))
+        return array('d', (matrix.determinant() for matrix in self.to_matrices()))
+
+    def __str__(self) -> str:
+        return '\n\n'.join(str(matrix) for matrix in self.to_matrices())
+
+    def __repr__(self) -> str:
+        return f"MatrixBatch({self.count} x {self.rows}x{self.cols})"
+
+
+def _interleave(components: List[Iterable[float]]) -> array:
+    """Собрать пакет из потоков по позициям (пустой список - матрицы без элементов)"""
+    if not components:
+        return array('d')
+    return array('d', chain.from_iterable(zip(*components)))
+
+
+def _batch_matmul(a: List[array], b: List[array], rows: int, inner: int, cols: int, count: int) -> array:
+    """Попарные произведения: элемент (i, j) - сумма по k срезов a[i, k] * b[k, j].
+
+    Все потоки ленивые, поэтому пакет результата собирается за один проход.
+    """
+    components = []
+    for i in range(rows):
+        for j in range(cols):
+            terms = [map(mul, a[i * inner + k], b[k * cols + j]) for k in range(inner)]
+            stream = terms[0] if terms else repeat(0.0, count)
+            for term in terms[1:]:
+                stream = map(add, stream, term)
+            components.append(stream)
+    return _interleave(components)
+
+
+if __name__ == "__main__":
+    print("=== Пакеты малых матриц ===")
+
+    batch = MatrixBatch([Matrix([[1, 2], [3, 4]]), Matrix([[2, 0], [1, 3]]), Matrix([[0, 1], [1, 0]])])
+    other = MatrixBatch([Matrix([[1, 0], [0, 1]]), Matrix([[1, 1], [1, 1]]), Matrix([[2, 3], [4, 5]])])
+
+    print("batch =", repr(batch), batch.to_list())
+    print("batch + other =", (batch + other).to_list())
+    print("batch * other =", (batch * other).to_list())
+    print("batch * 2 =", (batch * 2).to_list())
+    print("batch.transpose() =", batch.transpose().to_list())
+    print("batch.determinant() =", batch.determinant().tolist())
+    print("batch[1] =", batch[1].to_list())
@@ -1,6 +1,58 @@
-from typing import List, Union
+import math
+from collections import OrderedDict
+from fractions import Fraction
+from operator import add, mul, sub
+from typing import Any, Dict, Iterable, List, Optional, Union, Tuple, Callable
 from numbers import Number
 
+from oop import DETERMINANT_METHODS, _exact_determinant
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy необязателен
+    np = None
+
+# Реестр вычислительных бэкендов. 'python' - встроенный код функций ниже,
+# прочие бэкенды регистрируются словарём {операция: функция(списки) -> результат}.
+BACKEND_OPERATIONS = ('add', 'scale', 'matmul', 'transpose', 'determinant')
+# Меньше этой работы (элементов или умножений) накладные расходы бэкенда не окупаются
+BACKEND_MIN_WORK = 512
+
+_backends: Dict[str, Dict[str, Callable[..., Any]]] = {'python': {}}
+_backend_choice: Dict[str, str] = {op: 'python' for op in BACKEND_OPERATIONS}
+
+
+def register_backend(name: str, operations: Dict[str, Callable[..., Any]]) -> None:
+    """Зарегистрировать бэкенд с реализациями части операций"""
+    unknown = set(operations) - set(BACKEND_OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations: {sorted(unknown)}")
+    _backends[name] = dict(operations)
+
+
+def set_backend(name: str, operations: Optional[Iterable[str]] = None) -> None:
+    """Выбрать бэкенд для операций (по умолчанию - для всех, которые он умеет)"""
+    if name not in _backends:
+        raise ValueError(f"Unknown backend {name!r}, available: {sorted(_backends)}")
+    for op in operations if operations is not None else BACKEND_OPERATIONS:
+        if op not in _backend_choice:
+            raise ValueError(f"Unknown operation {op!r}")
+        if name == 'python' or op in _backends[name]:
+            _backend_choice[op] = name
+
+
+def get_backend(operation: str) -> str:
+    """Имя бэкенда, выбранного для операции"""
+    return _backend_choice[operation]
+
+
+def _accelerated(operation: str, work: int) -> Optional[Callable[..., Any]]:
+    """Реализация операции из выбранного бэкенда или None для встроенного кода"""
+    name = _backend_choice[operation]
+    if name == 'python' or work < BACKEND_MIN_WORK:
+        return None
+    return _backends[name][operation]
+
 
 def create_matrix(data: List[List[float]]) -> List[List[float]]:
     """Создать матрицу"""
@@ -22,16 +74,27 @@ def matrix_add(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
     if len(a) != len(b) or len(a[0]) != len(b[0]):
         raise ValueError("Matrices must have the same dimensions for addition")
 
+    fast = _accelerated('add', len(a) * len(a[0]))
+    if fast is not None:
+        return fast(a, b)
     return [
         [a[i][j] + b[i][j] for j in range(len(a[0]))]
         for i in range(len(a))
     ]
 
 
-def matrix_multiply(a: List[List[float]], b: Union[List[List[float]], Number]) -> List[List[float]]:
-    """Умножение матриц или на скаляр"""
+def matrix_multiply(a: List[List[float]], b: Union[List[List[float]], Number],
+                    strategy: str = 'auto') -> List[List[float]]:
+    """Умножение матриц или на скаляр.
+
+    strategy для умножения матриц: 'auto' (бэкенд или алгоритм по размеру), 'naive',
+    'ikj', 'transposed', 'blocked' или 'strassen'.
+    """
     if isinstance(b, Number):
         # Умножение на скаляр
+        fast = _accelerated('scale', len(a) * len(a[0]))
+        if fast is not None:
+            return fast(a, b)
         return [
             [a[i][j] * b for j in range(len(a[0]))]
             for i in range(len(a))
@@ -41,28 +104,162 @@ def matrix_multiply(a: List[List[float]], b: Union[List[List[float]], Number]) -
         if len(a[0]) != len(b):
             raise ValueError("Number of columns in first matrix must equal number of rows in second")
 
-        result = [[0] * len(b[0]) for _ in range(len(a))]
-        for i in range(len(a)):
-            for j in range(len(b[0])):
-                for k in range(len(a[0])):
-                    result[i][j] += a[i][k] * b[k][j]
-        return result
+        if strategy == 'auto':
+            fast = _accelerated('matmul', len(a) * len(b) * len(b[0]))
+            if fast is not None:
+                return fast(a, b)
+            strategy = _choose_multiply_strategy(len(a), len(b), len(b[0]))
+        if strategy not in _MULTIPLY_ENGINES:
+            raise ValueError(f"Unknown multiplication strategy {strategy!r}, "
+                             f"expected one of {sorted(_MULTIPLY_ENGINES)} or 'auto'")
+        return _MULTIPLY_ENGINES[strategy](a, b)
+
+
+BLOCK_SIZE = 64
+STRASSEN_THRESHOLD = 256
+STRASSEN_LEAF = 64
+
+
+def _multiply_naive(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    """Классический цикл i-j-k (эталон)"""
+    result = [[0] * len(b[0]) for _ in range(len(a))]
+    for i in range(len(a)):
+        for j in range(len(b[0])):
+            for k in range(len(a[0])):
+                result[i][j] += a[i][k] * b[k][j]
+    return result
+
+
+def _multiply_transposed(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    """Строки a на столбцы b, вырезанные один раз: скалярные произведения идут в C"""
+    columns = list(zip(*b))
+    return [[sum(map(mul, row, column)) for column in columns] for row in a]
+
+
+def _multiply_ikj(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    """Порядок i-k-j: строка результата накапливается из целых строк b"""
+    result = []
+    for row in a:
+        acc = [0] * len(b[0])
+        for factor, b_row in zip(row, b):
+            if factor:
+                acc = [x + factor * y for x, y in zip(acc, b_row)]
+        result.append(acc)
+    return result
+
+
+def _multiply_blocked(a: List[List[float]], b: List[List[float]],
+                      block: int = BLOCK_SIZE) -> List[List[float]]:
+    """Порядок i-k-j по плиткам block x block"""
+    inner, cols = len(b), len(b[0])
+    result = [[0] * cols for _ in range(len(a))]
+    for kk in range(0, inner, block):
+        k_end = min(kk + block, inner)
+        for jj in range(0, cols, block):
+            j_end = min(jj + block, cols)
+            b_tile = [b[k][jj:j_end] for k in range(kk, k_end)]
+            for i, row in enumerate(a):
+                acc = result[i][jj:j_end]
+                for k in range(kk, k_end):
+                    factor = row[k]
+                    if factor:
+                        acc = [x + factor * y for x, y in zip(acc, b_tile[k - kk])]
+                result[i][jj:j_end] = acc
+    return result
+
+
+def _elementwise(op: Callable[[float, float], float], x: List[List[float]],
+                 y: List[List[float]]) -> List[List[float]]:
+    return [list(map(op, row_x, row_y)) for row_x, row_y in zip(x, y)]
+
+
+def _strassen_square(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    size = len(a)
+    if size <= STRASSEN_LEAF or size % 2:
+        return _multiply_transposed(a, b)
+    h = size // 2
+    a11, a12 = [row[:h] for row in a[:h]], [row[h:] for row in a[:h]]
+    a21, a22 = [row[:h] for row in a[h:]], [row[h:] for row in a[h:]]
+    b11, b12 = [row[:h] for row in b[:h]], [row[h:] for row in b[:h]]
+    b21, b22 = [row[:h] for row in b[h:]], [row[h:] for row in b[h:]]
+
+    m1 = _strassen_square(_elementwise(add, a11, a22), _elementwise(add, b11, b22))
+    m2 = _strassen_square(_elementwise(add, a21, a22), b11)
+    m3 = _strassen_square(a11, _elementwise(sub, b12, b22))
+    m4 = _strassen_square(a22, _elementwise(sub, b21, b11))
+    m5 = _strassen_square(_elementwise(add, a11, a12), b22)
+    m6 = _strassen_square(_elementwise(sub, a21, a11), _elementwise(add, b11, b12))
+    m7 = _strassen_square(_elementwise(sub, a12, a22), _elementwise(add, b21, b22))
+
+    c11 = _elementwise(add, _elementwise(sub, _elementwise(add, m1, m4), m5), m7)
+    c12 = _elementwise(add, m3, m5)
+    c21 = _elementwise(add, m2, m4)
+    c22 = _elementwise(add, _elementwise(add, _elementwise(sub, m1, m2), m3), m6)
+    return [left + right for left, right in zip(c11, c12)] + [left + right for left, right in zip(c21, c22)]
+
+
+def _multiply_strassen(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    """Штрассен: 7 умножений половинного размера вместо 8, листья - transposed"""
+    rows, cols = len(a), len(b[0])
+    size = max(rows, len(b), cols)
+    # Размер вида s * 2^levels с s <= STRASSEN_LEAF: дополнение нулями минимально
+    levels = 0
+    while -(-size // (1 << levels)) > STRASSEN_LEAF:
+        levels += 1
+    padded = -(-size // (1 << levels)) << levels
+
+    def pad(x: List[List[float]]) -> List[List[float]]:
+        return [row + [0] * (padded - len(row)) for row in x] + [[0] * padded for _ in range(padded - len(x))]
+
+    product = _strassen_square(pad(a), pad(b))
+    return [row[:cols] for row in product[:rows]]
+
+
+_MULTIPLY_ENGINES = {
+    'naive': _multiply_naive,
+    'ikj': _multiply_ikj,
+    'transposed': _multiply_transposed,
+    'blocked': _multiply_blocked,
+    'strassen': _multiply_strassen,
+}
+
+
+def _choose_multiply_strategy(rows: int, inner: int, cols: int) -> str:
+    """Штрассен - для больших почти квадратных матриц, иначе транспонированный правый операнд"""
+    if min(rows, inner, cols) >= STRASSEN_THRESHOLD and max(rows, inner, cols) <= 2 * min(rows, inner, cols):
+        return 'strassen'
+    return 'transposed'
 
 
 def matrix_transpose(a: List[List[float]]) -> List[List[float]]:
     """Транспонирование матрицы"""
+    fast = _accelerated('transpose', len(a) * len(a[0]))
+    if fast is not None:
+        return fast(a)
     return [
         [a[j][i] for j in range(len(a))]
         for i in range(len(a[0]))
     ]
 
 
-def matrix_determinant(a: List[List[float]]) -> float:
-    """Вычисление определителя матрицы"""
+def matrix_determinant(a: List[List[float]], method: str = 'auto') -> Union[float, int, Fraction]:
+    """Вычисление определителя матрицы.
+
+    method: 'auto' - точно (int или Fraction) для матриц из int и Fraction,
+    иначе в float; 'lu' - всегда в float; 'bareiss' или 'modular' - всегда точно.
+    """
     if len(a) != len(a[0]):
         raise ValueError("Determinant is defined only for square matrices")
+    if method not in DETERMINANT_METHODS:
+        raise ValueError(f"Unknown determinant method {method!r}, expected one of {DETERMINANT_METHODS}")
+    if method in ('bareiss', 'modular'):
+        return _exact_determinant(a, method)
 
     n = len(a)
+    exact = method == 'auto' and _is_exact(a)
+    fast = None if exact else _accelerated('determinant', n ** 3)
+    if fast is not None:
+        return fast(a)
     if n == 1:
         return a[0][0]
     elif n == 2:
@@ -71,21 +268,232 @@ def matrix_determinant(a: List[List[float]]) -> float:
         # Правило Саррюса для матрицы 3x3
         return (a[0][0] * a[1][1] * a[2][2] + a[0][1] * a[1][2] * a[2][0] + a[0][2] * a[1][0] * a[2][1]
                 - a[0][2] * a[1][1] * a[2][0] - a[0][1] * a[1][0] * a[2][2] - a[0][0] * a[1][2] * a[2][1])
+    elif exact:
+        # Без перехода к float
+        return _exact_determinant(a)
     else:
-        # Рекурсивное вычисление для матриц большего порядка
-        det = 0
-        for j in range(n):
-            minor = []
-            for i in range(1, n):
-                row = []
-                for k in range(n):
-                    if k != j:
-                        row.append(a[i][k])
-                minor.append(row)
-            det += ((-1) ** j) * a[0][j] * matrix_determinant(minor)
+        # LU-разложение с выбором ведущего элемента: O(n^3)
+        lu, _, sign = matrix_lu(a)
+        det = float(sign)
+        for i in range(n):
+            det *= lu[i][i]
         return det
 
 
+def matrix_lu(a: List[List[float]]) -> Tuple[List[List[float]], List[int], int]:
+    """LU-разложение P A = L U: (L и U в одной таблице, перестановка строк, знак перестановки)"""
+    if len(a) != len(a[0]):
+        raise ValueError("LU decomposition is defined only for square matrices")
+
+    n = len(a)
+    lu = [[float(x) for x in row] for row in a]
+    pivots = list(range(n))
+    sign = 1
+    for k in range(n):
+        p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+        if lu[p][k] == 0:
+            # Вырожденная матрица: на диагонали U останется ноль
+            continue
+        if p != k:
+            lu[k], lu[p] = lu[p], lu[k]
+            pivots[k], pivots[p] = pivots[p], pivots[k]
+            sign = -sign
+        tail = lu[k][k + 1:]
+        for i in range(k + 1, n):
+            factor = lu[i][k] / lu[k][k]
+            lu[i][k] = factor
+            if factor:
+                lu[i][k + 1:] = [x - factor * y for x, y in zip(lu[i][k + 1:], tail)]
+    return lu, pivots, sign
+
+
+def matrix_lu_solve(factorization: Tuple[List[List[float]], List[int], int],
+                    b: List[List[float]]) -> List[List[float]]:
+    """Решить A X = B по готовому LU-разложению (B - матрица правых частей)"""
+    lu, pivots, _ = factorization
+    n = len(lu)
+    if any(lu[i][i] == 0 for i in range(n)):
+        raise ValueError("Matrix is singular")
+    if len(b) != n:
+        raise ValueError("Right-hand side must have as many rows as the matrix")
+
+    y = [list(b[p]) for p in pivots]
+    for i in range(n):
+        for j in range(i):
+            if lu[i][j]:
+                y[i] = [x - lu[i][j] * c for x, c in zip(y[i], y[j])]
+    for i in reversed(range(n)):
+        for j in range(i + 1, n):
+            if lu[i][j]:
+                y[i] = [x - lu[i][j] * c for x, c in zip(y[i], y[j])]
+        y[i] = [x / lu[i][i] for x in y[i]]
+    return y
+
+
+def matrix_solve(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    """Решить A X = B"""
+    return matrix_lu_solve(matrix_lu(a), b)
+
+
+def matrix_inverse(a: List[List[float]]) -> List[List[float]]:
+    """Обратная матрица"""
+    n = len(a)
+    identity = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    return matrix_lu_solve(matrix_lu(a), identity)
+
+
+def matrix_log_abs_determinant(a: List[List[float]]) -> float:
+    """Натуральный логарифм модуля определителя"""
+    lu, _, _ = matrix_lu(a)
+    diagonal = [lu[i][i] for i in range(len(lu))]
+    if any(x == 0 for x in diagonal):
+        return -math.inf
+    return math.fsum(math.log(abs(x)) for x in diagonal)
+
+
+# Точный определитель (Bareiss и модульный метод с китайской теоремой об
+# остатках) общий с oop.py; здесь только проверка, что матрица точная
+def _is_exact(a: List[List[Any]]) -> bool:
+    return all(isinstance(x, (int, Fraction)) for row in a for x in row)
+
+
+# Степени матрицы. Вычисленные степени (и квадраты M^(2^i)) хранятся в общем
+# LRU-кэше по содержимому матрицы: M^1000 после M^512 достраивается из них.
+POWER_CACHE_SIZE = 32
+POWER_METHODS = ('auto', 'squaring', 'eigen')
+# Метод Якоби останавливается, когда внедиагональная часть становится
+# пренебрежимо малой относительно всей матрицы
+JACOBI_TOLERANCE = 1e-30
+JACOBI_MAX_SWEEPS = 100
+
+_power_cache: 'OrderedDict[Tuple[Any, Any], Any]' = OrderedDict()
+
+
+def _cached_power(key: Any, k: Any) -> Optional[Any]:
+    if (key, k) not in _power_cache:
+        return None
+    _power_cache.move_to_end((key, k))
+    return _power_cache[key, k]
+
+
+def _remember_power(key: Any, k: Any, value: Any) -> None:
+    _power_cache[key, k] = value
+    _power_cache.move_to_end((key, k))
+    while len(_power_cache) > POWER_CACHE_SIZE:
+        _power_cache.popitem(last=False)
+
+
+def _jacobi_eigen(a: List[List[float]]) -> Tuple[List[float], List[List[float]]]:
+    """Собственные значения и векторы (по столбцам) симметричной матрицы методом вращений Якоби"""
+    n = len(a)
+    a = [row[:] for row in a]
+    v = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    total = sum(x * x for row in a for x in row)
+    for _ in range(JACOBI_MAX_SWEEPS):
+        off = sum(a[p][q] ** 2 for p in range(n) for q in range(p + 1, n))
+        if off <= JACOBI_TOLERANCE * total:
+            break
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if a[p][q] == 0.0:
+                    continue
+                # Вращение в плоскости (p, q), обнуляющее a[p][q]
+                theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+                t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+                for row in a:
+                    row[p], row[q] = c * row[p] - s * row[q], s * row[p] + c * row[q]
+                a[p], a[q] = ([c * x - s * y for x, y in zip(a[p], a[q])],
+                              [s * x + c * y for x, y in zip(a[p], a[q])])
+                for row in v:
+                    row[p], row[q] = c * row[p] - s * row[q], s * row[p] + c * row[q]
+    return [a[i][i] for i in range(n)], v
+
+
+def _eigen_power(a: List[List[float]], key: Any, k: int) -> List[List[float]]:
+    """M^k = V diag(l^k) V^T по кэшированному разложению симметричной матрицы (V^-1 = V^T)"""
+    decomposition = _cached_power(key, 'eigen')
+    if decomposition is None:
+        n = len(a)
+        if any(a[i][j] != a[j][i] for i in range(n) for j in range(i)):
+            raise ValueError("The 'eigen' power method requires a symmetric matrix")
+        decomposition = _jacobi_eigen([[float(x) for x in row] for row in a])
+        _remember_power(key, 'eigen', decomposition)
+    values, vectors = decomposition
+    if k < 0 and 0.0 in values:
+        raise ValueError("Matrix is singular")
+    powers = [l ** k for l in values]
+    scaled = [[x * p for x, p in zip(row, powers)] for row in vectors]
+    return matrix_multiply(scaled, matrix_transpose(vectors))
+
+
+def matrix_power(a: List[List[float]], k: int, method: str = 'auto') -> List[List[float]]:
+    """Степень матрицы a^k (k < 0 - степень обратной).
+
+    method: 'auto' или 'squaring' - возведение в квадрат, O(log k) умножений;
+    'eigen' - через спектральное разложение (только для симметричных матриц).
+    """
+    if len(a) != len(a[0]):
+        raise ValueError("Matrix power is defined only for square matrices")
+    if not isinstance(k, int):
+        raise TypeError(f"Matrix power must be an integer, got {type(k).__name__}")
+    if method not in POWER_METHODS:
+        raise ValueError(f"Unknown power method {method!r}, expected one of {POWER_METHODS}")
+    n = len(a)
+    if k == 0:
+        return [[1 if i == j else 0 for j in range(n)] for i in range(n)]
+    key = tuple(map(tuple, a))
+    # Приближённые результаты 'eigen' хранятся отдельно от точных, чтобы
+    # возведение в квадрат никогда не начинало с округлённой степени
+    power_key = ('eigen', k) if method == 'eigen' else k
+    result = _cached_power(key, power_key)
+    if result is None:
+        if method == 'eigen':
+            result = _eigen_power(a, key, k)
+        elif k < 0:
+            inverse = _cached_power(key, -1)
+            if inverse is None:
+                inverse = matrix_inverse(a)
+                _remember_power(key, -1, inverse)
+            result = matrix_power(inverse, -k, method)
+        else:
+            # Начинаем с наибольшей известной степени, не превосходящей k
+            known = max((e for cached_key, e in _power_cache
+                         if cached_key == key and isinstance(e, int) and 0 < e <= k), default=0)
+            result = _cached_power(key, known) if known else None
+            remainder = k - known
+            square, exponent = [row[:] for row in a], 1
+            while remainder:
+                if remainder & 1:
+                    result = square if result is None else matrix_multiply(result, square)
+                remainder >>= 1
+                if remainder:
+                    exponent *= 2
+                    next_square = _cached_power(key, exponent)
+                    if next_square is None:
+                        next_square = matrix_multiply(square, square)
+                        _remember_power(key, exponent, next_square)
+                    square = next_square
+        _remember_power(key, power_key, result)
+    # Кэш хранит свои копии: результат можно менять без последствий
+    return [row[:] for row in result]
+
+
+# Бэкенд NumPy: списки превращаются в ndarray только на входе и выходе функции
+if np is not None:
+    def _as_ndarray(a: List[List[float]]) -> Any:
+        return np.asarray(a, dtype=np.float64)
+
+    register_backend('numpy', {
+        'add': lambda a, b: (_as_ndarray(a) + _as_ndarray(b)).tolist(),
+        'scale': lambda a, factor: (_as_ndarray(a) * factor).tolist(),
+        'matmul': lambda a, b: (_as_ndarray(a) @ _as_ndarray(b)).tolist(),
+        'transpose': lambda a: _as_ndarray(a).T.tolist(),
+        'determinant': lambda a: float(np.linalg.det(_as_ndarray(a))),
+    })
+    set_backend('numpy')
+
 
 if __name__ == "__main__":
     print("=== Функциональная реализация матриц ===")
@@ -107,4 +515,20 @@ if __name__ == "__main__":
     print("matrix_multiply(m1, m2) =", m4)
     print("matrix_transpose(m1) =", m5)
     print("matrix_determinant(m1) =", det)
+    print("matrix_solve(m1, [[1], [1]]) =", matrix_solve(m1, [[1], [1]]))
+    print("matrix_inverse(m1) =", matrix_inverse(m1))
+
+    print("\n--- Точный определитель ---")
+    # Матрица Вандермонда: определитель - произведение разностей узлов, 1 * 2 * 3 * 1 * 2 * 1 = 12
+    big = [[(10 ** 6 + i) ** j for j in range(4)] for i in range(4)]
+    print("matrix_determinant(big) =", matrix_determinant(big))
+    print("matrix_determinant(big, 'modular') =", matrix_determinant(big, 'modular'))
+    print("matrix_determinant(big, 'lu') =", matrix_determinant(big, 'lu'))
+
+    print("\n--- Степени матрицы ---")
+    fibonacci = [[1, 1], [1, 0]]
+    print("matrix_power(fibonacci, 90) =", matrix_power(fibonacci, 90))
+    print("matrix_power(fibonacci, 100) (из кэша) =", matrix_power(fibonacci, 100))
+    print("matrix_power(fibonacci, 10, 'eigen') =",
+          [[round(x, 6) for x in row] for row in matrix_power(fibonacci, 10, 'eigen')])
 
@@ -1,15 +1,358 @@
-from typing import List, Union
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from itertools import chain, repeat
+from operator import add, mul, sub
+from typing import Any, Callable, Dict, Iterable, List, Union, Tuple, Optional
 from numbers import Number
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy необязателен
+    np = None
+
+# Реестр вычислительных бэкендов. 'python' - встроенный код Matrix, прочие
+# бэкенды регистрируются словарём {операция: функция(Matrix, ...) -> результат}.
+BACKEND_OPERATIONS = ('add', 'scale', 'matmul', 'transpose', 'determinant')
+# Меньше этой работы (элементов или умножений) накладные расходы бэкенда не окупаются
+BACKEND_MIN_WORK = 512
+
+_backends: Dict[str, Dict[str, Callable[..., Any]]] = {'python': {}}
+_backend_choice: Dict[str, str] = {op: 'python' for op in BACKEND_OPERATIONS}
+
+
+def register_backend(name: str, operations: Dict[str, Callable[..., Any]]) -> None:
+    """Зарегистрировать бэкенд с реализациями части операций.
+
+    Функции add, scale и matmul принимают необязательный именованный аргумент
+    out - матрицу, в которую нужно записать результат и вернуть её.
+    """
+    unknown = set(operations) - set(BACKEND_OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations: {sorted(unknown)}")
+    _backends[name] = dict(operations)
+
+
+def set_backend(name: str, operations: Optional[Iterable[str]] = None) -> None:
+    """Выбрать бэкенд для операций (по умолчанию - для всех, которые он умеет)"""
+    if name not in _backends:
+        raise ValueError(f"Unknown backend {name!r}, available: {sorted(_backends)}")
+    for op in operations if operations is not None else BACKEND_OPERATIONS:
+        if op not in _backend_choice:
+            raise ValueError(f"Unknown operation {op!r}")
+        if name == 'python' or op in _backends[name]:
+            _backend_choice[op] = name
+
+
+def get_backend(operation: str) -> str:
+    """Имя бэкенда, выбранного для операции"""
+    return _backend_choice[operation]
+
+
+def _accelerated(operation: str, work: int) -> Optional[Callable[..., Any]]:
+    """Реализация операции из выбранного бэкенда или None для встроенного кода"""
+    name = _backend_choice[operation]
+    if name == 'python' or work < BACKEND_MIN_WORK:
+        return None
+    return _backends[name][operation]
+
+
+# Движок умножения матриц. Все функции принимают построчные массивы
+# a (rows x inner) и b (inner x cols) и возвращают построчный array('d').
+BLOCK_SIZE = 64
+STRASSEN_THRESHOLD = 256
+STRASSEN_LEAF = 64
+
+
+def _copy_doubles(data: Any) -> array:
+    """Собственная копия array('d') или memoryview файла одним копированием памяти"""
+    result = array('d')
+    result.frombytes(memoryview(data).cast('B'))
+    return result
+
+
+def _zeros(count: int) -> array:
+    return array('d', bytes(8 * count))
+
+
+def _multiply_naive(a: array, b: array, rows: int, inner: int, cols: int) -> array:
+    """Классический цикл i-j-k (эталон)"""
+    result = _zeros(rows * cols)
+    for i in range(rows):
+        for j in range(cols):
+            total = 0.0
+            for k in range(inner):
+                total += a[i * inner + k] * b[k * cols + j]
+            result[i * cols + j] = total
+    return result
+
+
+def _multiply_transposed(a: array, b: array, rows: int, inner: int, cols: int) -> array:
+    """Строки a на заранее вырезанные столбцы b: скалярные произведения идут в C"""
+    columns = [b[j::cols] for j in range(cols)]
+    result = array('d')
+    for i in range(rows):
+        row = a[i * inner:(i + 1) * inner]
+        result.extend([sum(map(mul, row, column)) for column in columns])
+    return result
+
+
+def _multiply_ikj(a: array, b: array, rows: int, inner: int, cols: int) -> array:
+    """Порядок i-k-j: строка результата накапливается из целых строк b"""
+    b_rows = [b[k * cols:(k + 1) * cols] for k in range(inner)]
+    result = array('d')
+    for i in range(rows):
+        acc = [0.0] * cols
+        for k in range(inner):
+            factor = a[i * inner + k]
+            if factor:
+                acc = [x + factor * y for x, y in zip(acc, b_rows[k])]
+        result.extend(acc)
+    return result
+
+
+def _multiply_blocked(a: array, b: array, rows: int, inner: int, cols: int,
+                      block: int = BLOCK_SIZE) -> array:
+    """Порядок i-k-j по плиткам block x block, чтобы рабочие строки b оставались в кэше"""
+    out = [[0.0] * cols for _ in range(rows)]
+    for kk in range(0, inner, block):
+        k_end = min(kk + block, inner)
+        for jj in range(0, cols, block):
+            j_end = min(jj + block, cols)
+            b_tile = [b[k * cols + jj:k * cols + j_end] for k in range(kk, k_end)]
+            for i in range(rows):
+                acc = out[i][jj:j_end]
+                base = i * inner
+                for k in range(kk, k_end):
+                    factor = a[base + k]
+                    if factor:
+                        acc = [x + factor * y for x, y in zip(acc, b_tile[k - kk])]
+                out[i][jj:j_end] = acc
+    return array('d', chain.from_iterable(out))
+
+
+def _pad(a: array, rows: int, cols: int, size: int) -> array:
+    """Дополнить матрицу нулями до квадратной size x size"""
+    if rows == cols == size:
+        return a
+    result = array('d')
+    tail = _zeros(size - cols)
+    for i in range(rows):
+        result.extend(a[i * cols:(i + 1) * cols])
+        result.extend(tail)
+    result.extend(_zeros((size - rows) * size))
+    return result
+
+
+def _quadrants(a: array, size: int) -> Tuple[array, array, array, array]:
+    half = size // 2
+    parts = (array('d'), array('d'), array('d'), array('d'))
+    for i in range(size):
+        row = i * size
+        top = 0 if i < half else 2
+        parts[top].extend(a[row:row + half])
+        parts[top + 1].extend(a[row + half:row + size])
+    return parts
+
+
+def _strassen_square(a: array, b: array, size: int) -> array:
+    if size <= STRASSEN_LEAF or size % 2:
+        return _multiply_transposed(a, b, size, size, size)
+    half = size // 2
+    a11, a12, a21, a22 = _quadrants(a, size)
+    b11, b12, b21, b22 = _quadrants(b, size)
+
+    def plus(x: array, y: array) -> array:
+        return array('d', map(add, x, y))
+
+    def minus(x: array, y: array) -> array:
+        return array('d', map(sub, x, y))
+
+    m1 = _strassen_square(plus(a11, a22), plus(b11, b22), half)
+    m2 = _strassen_square(plus(a21, a22), b11, half)
+    m3 = _strassen_square(a11, minus(b12, b22), half)
+    m4 = _strassen_square(a22, minus(b21, b11), half)
+    m5 = _strassen_square(plus(a11, a12), b22, half)
+    m6 = _strassen_square(minus(a21, a11), plus(b11, b12), half)
+    m7 = _strassen_square(minus(a12, a22), plus(b21, b22), half)
+
+    c11 = plus(minus(plus(m1, m4), m5), m7)
+    c12 = plus(m3, m5)
+    c21 = plus(m2, m4)
+    c22 = plus(plus(minus(m1, m2), m3), m6)
+
+    result = array('d')
+    for top, bottom in ((c11, c12), (c21, c22)):
+        for i in range(half):
+            result.extend(top[i * half:(i + 1) * half])
+            result.extend(bottom[i * half:(i + 1) * half])
+    return result
+
+
+def _multiply_strassen(a: array, b: array, rows: int, inner: int, cols: int) -> array:
+    """Штрассен: 7 умножений половинного размера вместо 8, листья - transposed"""
+    size = max(rows, inner, cols, 1)
+    # Размер вида s * 2^levels с s <= STRASSEN_LEAF: дополнение нулями минимально
+    levels = 0
+    while -(-size // (1 << levels)) > STRASSEN_LEAF:
+        levels += 1
+    padded = -(-size // (1 << levels)) << levels
+    product = _strassen_square(_pad(a, rows, inner, padded), _pad(b, inner, cols, padded), padded)
+    if padded == rows == cols:
+        return product
+    result = array('d')
+    for i in range(rows):
+        result.extend(product[i * padded:i * padded + cols])
+    return result
+
+
+_MULTIPLY_ENGINES = {
+    'naive': _multiply_naive,
+    'ikj': _multiply_ikj,
+    'transposed': _multiply_transposed,
+    'blocked': _multiply_blocked,
+    'strassen': _multiply_strassen,
+}
+
+
+def _choose_multiply_strategy(rows: int, inner: int, cols: int) -> str:
+    """Штрассен - для больших почти квадратных матриц, иначе транспонированный правый операнд"""
+    if min(rows, inner, cols) >= STRASSEN_THRESHOLD and max(rows, inner, cols) <= 2 * min(rows, inner, cols):
+        return 'strassen'
+    return 'transposed'
+
 
 class Matrix:
-    """Матрица в ООП стиле"""
+    """Матрица в ООП стиле
+
+    Элементы хранятся в одном непрерывном массиве array('d'): элемент (i, j)
+    лежит по индексу i * strides[0] + j * strides[1]. Обычная матрица хранится
+    построчно (strides == (cols, 1)); transpose() возвращает вид с переставленными
+    шагами над тем же массивом, который копируется только при записи.
+    """
+
+    __slots__ = ('rows', 'cols', 'strides', '_data', '_lu', '_shared', '_powers', '_eigen', '_exported')
 
     def __init__(self, data: List[List[float]]) -> None:
         self._validate_matrix(data)
-        self._data = data
         self.rows = len(data)
         self.cols = len(data[0]) if data else 0
+        self.strides = (self.cols, 1)
+        self._data = array('d', chain.from_iterable(data))
+        self._lu: Optional[LUDecomposition] = None
+        # Массив данных может быть общим с видом transpose() - тогда запись сначала копирует его
+        self._shared = False
+        # Кэши степеней (LRU {показатель: матрица}) и спектрального разложения
+        self._powers: Optional[OrderedDict] = None
+        self._eigen: Optional[Tuple[List[float], 'Matrix']] = None
+        # После buffer() данные могут меняться в обход матрицы - тогда ничего не кэшируется
+        self._exported = False
+
+    @classmethod
+    def _from_flat(cls, rows: int, cols: int, data: array) -> 'Matrix':
+        """Создать матрицу поверх готового построчного массива без проверок и копирования"""
+        matrix = cls.__new__(cls)
+        matrix.rows = rows
+        matrix.cols = cols
+        matrix.strides = (cols, 1)
+        matrix._data = data
+        matrix._lu = None
+        matrix._shared = False
+        matrix._powers = None
+        matrix._eigen = None
+        matrix._exported = False
+        return matrix
+
+    def _contiguous(self) -> bool:
+        """Хранится ли матрица построчно (а не как транспонированный вид)"""
+        return self.strides == (self.cols, 1)
+
+    def _oriented(self) -> Tuple['Matrix', bool]:
+        """Построчная матрица над теми же данными и флаг: является ли self её транспонированием"""
+        if self._contiguous():
+            return self, False
+        base = Matrix._from_flat(self.cols, self.rows, self._data)
+        base._shared = True
+        return base, True
+
+    def _row_major(self) -> array:
+        """Элементы в построчном порядке: сам массив или (для вида) его транспонированная копия"""
+        if self._contiguous():
+            return self._data
+        base = Matrix._from_flat(self.cols, self.rows, self._data)
+        fast = _accelerated('transpose', len(self._data))
+        if fast is not None:
+            return fast(base)._data
+        executor = ParallelExecutor.active()
+        if executor is not None and executor.worth_it(len(self._data)):
+            return executor.transpose(base)._data
+        result = array('d')
+        for i in range(self.rows):
+            # Строка вида - столбец исходной построчной матрицы, срез с шагом rows
+            result.extend(self._data[i::self.rows])
+        return result
+
+    def _make_writable(self) -> None:
+        """Копирование при записи: вид или общий массив получают собственные данные"""
+        if not self._contiguous():
+            self._data = self._row_major()
+            self.strides = (self.cols, 1)
+        elif self._shared:
+            self._data = _copy_doubles(self._data)
+        self._shared = False
+        self._lu = None
+        self._powers = None
+        self._eigen = None
+
+    def _prepare_out(self, out: Optional['Matrix'], rows: int, cols: int) -> Optional['Matrix']:
+        """Проверить матрицу-приёмник результата и подготовить её к записи"""
+        if out is None:
+            return None
+        if not isinstance(out, Matrix) or out.rows != rows or out.cols != cols:
+            raise ValueError(f"out must be a {rows}x{cols} Matrix")
+        out._make_writable()
+        return out
+
+    @staticmethod
+    def _deliver(rows: int, cols: int, data: array, out: Optional['Matrix']) -> 'Matrix':
+        """Обернуть результат в новую матрицу или скопировать в хранилище out"""
+        if out is None:
+            return Matrix._from_flat(rows, cols, data)
+        # Длина совпадает, поэтому массив out не перевыделяется
+        out._data[:] = data
+        return out
+
+    def copy(self) -> 'Matrix':
+        """Независимая построчная копия"""
+        data = self._row_major()
+        return Matrix._from_flat(self.rows, self.cols, _copy_doubles(data) if data is self._data else data)
+
+    def save(self, path: str) -> None:
+        """Сохранить в бинарный файл: заголовок и сырые построчные данные одним блоком"""
+        data = self._row_major()
+        with open(path, 'wb') as file:
+            file.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, b'd', b'C', _BYTE_ORDER, self.rows, self.cols))
+            file.write(memoryview(data).cast('B'))
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False) -> 'Matrix':
+        """Отобразить файл save() в память без чтения: данные подгружаются ОС по мере обращения.
+
+        writable=True - запись в матрицу (+=, out=...) идёт прямо в файл,
+        иначе первая запись делает копию в памяти.
+        """
+        mapping, rows, cols = _map_file(path, writable)
+        start = _FILE_HEADER.size
+        matrix = cls._from_flat(rows, cols, memoryview(mapping)[start:start + 8 * rows * cols].cast('d'))
+        matrix._shared = not writable
+        return matrix
 
     def _validate_matrix(self, data: List[List[float]]) -> None:
         if not data:
@@ -20,42 +363,131 @@ class Matrix:
                 raise ValueError(
                     f"All rows must have the same length. Row {i} has {len(row)} elements, expected {cols}")
 
+    def lazy(self) -> 'LazyMatrix':
+        """Ленивая обёртка: операции строят дерево выражения до evaluate()"""
+        return LazyMatrix(self)
+
+    def to_list(self) -> List[List[float]]:
+        """Экспорт во вложенные списки"""
+        cols = self.cols
+        data = self._row_major()
+        return [data[i * cols:(i + 1) * cols].tolist() for i in range(self.rows)]
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        i, j = index
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError(f"Index {index} is out of range for a {self.rows}x{self.cols} matrix")
+        return self._data[i * self.strides[0] + j * self.strides[1]]
+
+    def buffer(self) -> memoryview:
+        """Двумерный memoryview (rows x cols) на данные матрицы без копирования.
+
+        Буфер доступен для записи, поэтому вид transpose() или общий с ним
+        массив сначала получают собственную построчную копию. Запись через
+        буфер не видна матрице, поэтому после buffer() она больше не кэширует
+        LU-разложение, степени и спектральное разложение.
+        """
+        self._make_writable()
+        self._exported = True
+        view = memoryview(self._data)
+        if not self.rows or not self.cols:
+            return view
+        return view.cast('B').cast('d', (self.rows, self.cols))
+
+    def __buffer__(self, flags: int) -> memoryview:
+        # Буферный протокол на уровне Python (PEP 688, Python 3.12+)
+        return self.buffer()
+
     def __add__(self, other: 'Matrix') -> 'Matrix':
         """Сложение матриц"""
         if not isinstance(other, Matrix):
             return NotImplemented
+        return self.add(other)
 
+    def __iadd__(self, other: 'Matrix') -> 'Matrix':
+        """Сложение на месте: результат пишется в хранилище self"""
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.add(other, out=self)
+
+    def add(self, other: 'Matrix', out: Optional['Matrix'] = None) -> 'Matrix':
+        """Сложение матриц; out - готовая матрица для результата (может совпадать с операндом)"""
+        if not isinstance(other, Matrix):
+            raise TypeError(f"Cannot add {type(other).__name__} to Matrix")
         if self.rows != other.rows or self.cols != other.cols:
             raise ValueError("Matrices must have the same dimensions for addition")
+        out = self._prepare_out(out, self.rows, self.cols)
 
-        result = [
-            [self._data[i][j] + other._data[i][j] for j in range(self.cols)]
-            for i in range(self.rows)
-        ]
-        return Matrix(result)
+        fast = _accelerated('add', len(self._data))
+        if fast is not None:
+            return fast(self, other) if out is None else fast(self, other, out=out)
+        executor = ParallelExecutor.active()
+        if executor is not None and executor.worth_it(len(self._data)):
+            return self._deliver(self.rows, self.cols, executor.add(self, other)._data, out)
+        values = array('d', map(add, self._row_major(), other._row_major()))
+        return self._deliver(self.rows, self.cols, values, out)
 
     def __mul__(self, other: Union['Matrix', Number]) -> 'Matrix':
         """Умножение матриц или на скаляр"""
-        if isinstance(other, Number):
-            # Умножение на скаляр
-            result = [
-                [self._data[i][j] * other for j in range(self.cols)]
-                for i in range(self.rows)
-            ]
-            return Matrix(result)
-        elif isinstance(other, Matrix):
-            # Умножение матриц
-            if self.cols != other.rows:
-                raise ValueError("Number of columns in first matrix must equal number of rows in second")
-
-            result = [[0] * other.cols for _ in range(self.rows)]
-            for i in range(self.rows):
-                for j in range(other.cols):
-                    for k in range(self.cols):
-                        result[i][j] += self._data[i][k] * other._data[k][j]
-            return Matrix(result)
-        else:
+        if not isinstance(other, (Matrix, Number)):
+            return NotImplemented
+        return self.multiply(other)
+
+    def __imul__(self, other: Number) -> 'Matrix':
+        """Умножение на скаляр на месте (матричное произведение меняет форму и создаёт новую матрицу)"""
+        if not isinstance(other, Number):
             return NotImplemented
+        return self.multiply(other, out=self)
+
+    def multiply(self, other: Union['Matrix', Number], out: Optional['Matrix'] = None) -> 'Matrix':
+        """Умножение на скаляр или матрицу; out - готовая матрица для результата"""
+        if isinstance(other, Matrix):
+            return self.matmul(other, out=out)
+        if not isinstance(other, Number):
+            raise TypeError(f"Cannot multiply Matrix by {type(other).__name__}")
+        out = self._prepare_out(out, self.rows, self.cols)
+        fast = _accelerated('scale', len(self._data))
+        if fast is not None:
+            return fast(self, other) if out is None else fast(self, other, out=out)
+        executor = ParallelExecutor.active()
+        if executor is not None and executor.worth_it(len(self._data)):
+            return self._deliver(self.rows, self.cols, executor.scale(self, other)._data, out)
+        values = array('d', map(mul, self._row_major(), repeat(other)))
+        return self._deliver(self.rows, self.cols, values, out)
+
+    def matmul(self, other: 'Matrix', strategy: str = 'auto', workers: Optional[int] = None,
+               out: Optional['Matrix'] = None) -> 'Matrix':
+        """Умножение матриц с выбором алгоритма.
+
+        strategy: 'auto' (бэкенд или алгоритм по размеру), 'naive', 'ikj', 'transposed',
+        'blocked' или 'strassen'. Явный алгоритм всегда выполняется встроенным кодом.
+        workers: число процессов; по умолчанию - активный ParallelExecutor, если он есть.
+        out: готовая матрица rows x other.cols для результата.
+        """
+        if self.cols != other.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second")
+        out = self._prepare_out(out, self.rows, other.cols)
+        if strategy == 'auto' and workers is None:
+            fast = _accelerated('matmul', self.rows * self.cols * other.cols)
+            if fast is not None:
+                return fast(self, other) if out is None else fast(self, other, out=out)
+            if not (self._contiguous() and other._contiguous()):
+                # Транспонированные виды читаются в нужном порядке без копирования
+                result = _multiply_oriented(*self._oriented(), *other._oriented())
+                return self._deliver(self.rows, other.cols, result._data, out)
+        if strategy == 'auto':
+            strategy = _choose_multiply_strategy(self.rows, self.cols, other.cols)
+        if strategy not in _MULTIPLY_ENGINES:
+            raise ValueError(f"Unknown multiplication strategy {strategy!r}, "
+                             f"expected one of {sorted(_MULTIPLY_ENGINES)} or 'auto'")
+        if workers is not None and workers > 1:
+            with ParallelExecutor(workers) as executor:
+                return self._deliver(self.rows, other.cols, executor.matmul(self, other, strategy)._data, out)
+        executor = ParallelExecutor.active()
+        if executor is not None and executor.worth_it(self.rows * self.cols * other.cols):
+            return self._deliver(self.rows, other.cols, executor.matmul(self, other, strategy)._data, out)
+        result = _MULTIPLY_ENGINES[strategy](self._row_major(), other._row_major(), self.rows, self.cols, other.cols)
+        return self._deliver(self.rows, other.cols, result, out)
 
     def __rmul__(self, other: Number) -> 'Matrix':
         """Умножение скаляра на матрицу"""
@@ -64,48 +496,947 @@ class Matrix:
         return NotImplemented
 
     def transpose(self) -> 'Matrix':
-        """Транспонирование матрицы"""
-        result = [
-            [self._data[j][i] for j in range(self.rows)]
-            for i in range(self.cols)
-        ]
-        return Matrix(result)
+        """Транспонирование матрицы: вид над теми же данными за O(1), копия - только при записи"""
+        view = Matrix._from_flat(self.cols, self.rows, self._data)
+        view.strides = (self.strides[1], self.strides[0])
+        view._shared = self._shared = True
+        return view
 
-    def determinant(self) -> float:
-        """Вычисление определителя матрицы"""
+    def determinant(self, method: str = 'auto') -> Union[float, int, Fraction]:
+        """Вычисление определителя матрицы.
+
+        method: 'auto' или 'lu' - в float; 'bareiss' или 'modular' - точно
+        (int или Fraction) по хранимым значениям без ошибок округления.
+        """
         if self.rows != self.cols:
             raise ValueError("Determinant is defined only for square matrices")
+        if method not in DETERMINANT_METHODS:
+            raise ValueError(f"Unknown determinant method {method!r}, expected one of {DETERMINANT_METHODS}")
+        if method in ('bareiss', 'modular'):
+            return _exact_determinant(self.to_list(), method)
 
+        fast = _accelerated('determinant', self.rows ** 3)
+        if fast is not None:
+            return fast(self)
+        # Для транспонированного вида формулы дают тот же определитель
+        d = self._data
         if self.rows == 1:
-            return self._data[0][0]
+            return d[0]
         elif self.rows == 2:
-            return self._data[0][0] * self._data[1][1] - self._data[0][1] * self._data[1][0]
+            return d[0] * d[3] - d[1] * d[2]
         elif self.rows == 3:
             # Правило Саррюса для матрицы 3x3
-            a, b, c = self._data[0]
-            d, e, f = self._data[1]
-            g, h, i = self._data[2]
-            return a * e * i + b * f * g + c * d * h - c * e * g - b * d * i - a * f * h
+            a, b, c, e, f, g, h, i, k = d
+            return a * f * k + b * g * h + c * e * i - c * f * h - b * e * k - a * g * i
+        else:
+            # LU-разложение с выбором ведущего элемента: O(n^3)
+            return self.lu().determinant()
+
+    def lu(self) -> 'LUDecomposition':
+        """LU-разложение с частичным выбором ведущего элемента (кэшируется)"""
+        if self.rows != self.cols:
+            raise ValueError("LU decomposition is defined only for square matrices")
+        if self._exported:
+            return LUDecomposition(self.to_list())
+        if self._lu is None:
+            self._lu = LUDecomposition(self.to_list())
+        return self._lu
+
+    def solve(self, b: Union['Matrix', List[float]]) -> Union['Matrix', List[float]]:
+        """Решить A x = b (b - вектор-список или матрица правых частей)"""
+        return self.lu().solve(b)
+
+    def inverse(self) -> 'Matrix':
+        """Обратная матрица"""
+        return self.lu().inverse()
+
+    def log_abs_determinant(self) -> float:
+        """Натуральный логарифм модуля определителя (без переполнения для больших n)"""
+        return self.lu().log_abs_determinant()
+
+    def _share(self) -> 'Matrix':
+        """Новая матрица над теми же данными: запись в неё не испортит кэш"""
+        if self._exported:
+            # Данные меняются через выданный буфер - делить их нельзя
+            return self.copy()
+        matrix = Matrix._from_flat(self.rows, self.cols, self._data)
+        matrix.strides = self.strides
+        matrix._shared = self._shared = True
+        return matrix
+
+    def _cached_power(self, k: Any) -> Optional['Matrix']:
+        if self._powers is None or k not in self._powers:
+            return None
+        self._powers.move_to_end(k)
+        return self._powers[k]
+
+    def _remember_power(self, k: Any, value: 'Matrix') -> None:
+        if self._exported:
+            return
+        if self._powers is None:
+            self._powers = OrderedDict()
+        self._powers[k] = value
+        self._powers.move_to_end(k)
+        while len(self._powers) > POWER_CACHE_SIZE:
+            self._powers.popitem(last=False)
+
+    def power(self, k: int, method: str = 'auto') -> 'Matrix':
+        """Степень матрицы M^k (k < 0 - степень обратной).
+
+        method: 'auto' или 'squaring' - возведение в квадрат, O(log k) умножений;
+        'eigen' - через спектральное разложение M = V diag(l) V^T (только для
+        симметричных матриц), одно умножение на степень после разложения.
+        Вычисленные степени хранятся в LRU-кэше матрицы: M^1000 после M^512
+        достраивается из уже известных M^512 и квадратов M^(2^i).
+        """
+        if self.rows != self.cols:
+            raise ValueError("Matrix power is defined only for square matrices")
+        if not isinstance(k, int):
+            raise TypeError(f"Matrix power must be an integer, got {type(k).__name__}")
+        if method not in POWER_METHODS:
+            raise ValueError(f"Unknown power method {method!r}, expected one of {POWER_METHODS}")
+        if k == 0:
+            return Matrix._from_flat(self.rows, self.cols, _identity(self.rows))
+        if k == 1:
+            return self._share()
+        if method == 'eigen':
+            # Результаты 'eigen' приближённые: они хранятся под ('eigen', k), чтобы
+            # точное возведение в квадрат не строилось на них
+            cached = self._cached_power(('eigen', k))
+            if cached is None:
+                cached = self._eigen_power(k)
+                self._remember_power(('eigen', k), cached)
+            return cached._share()
+        cached = self._cached_power(k)
+        if cached is not None:
+            return cached._share()
+        if k < 0:
+            inverse = self._cached_power(-1)
+            if inverse is None:
+                inverse = self.inverse()
+                self._remember_power(-1, inverse)
+            return inverse.power(-k, method)
+        # Начинаем с наибольшей известной степени, не превосходящей k
+        known = max((e for e in self._powers or () if isinstance(e, int) and 0 < e <= k), default=0)
+        result = self._cached_power(known) if known else None
+        remainder = k - known
+        square, exponent = self, 1
+        while remainder:
+            if remainder & 1:
+                result = square if result is None else result * square
+            remainder >>= 1
+            if remainder:
+                exponent *= 2
+                next_square = self._cached_power(exponent)
+                if next_square is None:
+                    next_square = square * square
+                    self._remember_power(exponent, next_square)
+                square = next_square
+        self._remember_power(k, result)
+        return result._share()
+
+    def __pow__(self, k: int) -> 'Matrix':
+        """Степень матрицы M ** k"""
+        if not isinstance(k, int):
+            return NotImplemented
+        return self.power(k)
+
+    def _eigen_power(self, k: int) -> 'Matrix':
+        """M^k = V diag(l^k) V^T по кэшированному разложению симметричной матрицы (V^-1 = V^T)"""
+        eigen = self._eigen
+        if eigen is None:
+            rows = self.to_list()
+            if any(rows[i][j] != rows[j][i] for i in range(self.rows) for j in range(i)):
+                raise ValueError("The 'eigen' power method requires a symmetric matrix")
+            values, vectors = _jacobi_eigen(rows)
+            eigen = (values, Matrix(vectors))
+            if not self._exported:
+                self._eigen = eigen
+        values, vectors = eigen
+        if k < 0 and 0.0 in values:
+            raise ValueError("Matrix is singular")
+        scaled = Matrix._from_flat(self.rows, self.cols, array(
+            'd', map(mul, vectors._data, chain.from_iterable(repeat([l ** k for l in values], self.rows)))))
+        return scaled * vectors.transpose()
+
+    def __str__(self) -> str:
+        return '\n'.join([' '.join(f'{elem:6.1f}' for elem in row) for row in self.to_list()])
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.to_list()})"
+
+
+
+class LUDecomposition:
+    """Разложение P A = L U с частичным выбором ведущего элемента
+
+    L (единичная нижнетреугольная) и U хранятся вместе в одной таблице строк,
+    pivots[i] - номер строки A, оказавшейся на месте i.
+    """
+
+    __slots__ = ('n', 'pivots', 'sign', 'singular', '_rows')
+
+    def __init__(self, data: List[List[float]]) -> None:
+        n = len(data)
+        rows = [[float(x) for x in row] for row in data]
+        pivots = list(range(n))
+        sign = 1
+        singular = False
+        for k in range(n):
+            p = max(range(k, n), key=lambda i: abs(rows[i][k]))
+            if rows[p][k] == 0:
+                singular = True
+                continue
+            if p != k:
+                rows[k], rows[p] = rows[p], rows[k]
+                pivots[k], pivots[p] = pivots[p], pivots[k]
+                sign = -sign
+            pivot_row = rows[k]
+            pivot = pivot_row[k]
+            tail = pivot_row[k + 1:]
+            for i in range(k + 1, n):
+                row = rows[i]
+                factor = row[k] / pivot
+                row[k] = factor
+                if factor:
+                    row[k + 1:] = [x - factor * y for x, y in zip(row[k + 1:], tail)]
+        self.n = n
+        self.pivots = pivots
+        self.sign = sign
+        self.singular = singular
+        self._rows = rows
+
+    def lower(self) -> Matrix:
+        """Матрица L"""
+        return Matrix([[1.0 if i == j else (row[j] if j < i else 0.0) for j in range(self.n)]
+                       for i, row in enumerate(self._rows)])
+
+    def upper(self) -> Matrix:
+        """Матрица U"""
+        return Matrix([[row[j] if j >= i else 0.0 for j in range(self.n)]
+                       for i, row in enumerate(self._rows)])
+
+    def determinant(self) -> float:
+        """Определитель: знак перестановки на произведение диагонали U"""
+        if self.singular:
+            return 0.0
+        det = float(self.sign)
+        for i, row in enumerate(self._rows):
+            det *= row[i]
+        return det
+
+    def log_abs_determinant(self) -> float:
+        """log|det A| (минус бесконечность для вырожденной матрицы)"""
+        if self.singular:
+            return -math.inf
+        return math.fsum(math.log(abs(row[i])) for i, row in enumerate(self._rows))
+
+    def _solve_rows(self, b: List[List[float]]) -> List[List[float]]:
+        """Прямая и обратная подстановка сразу для всех столбцов правой части"""
+        if self.singular:
+            raise ValueError("Matrix is singular")
+        if len(b) != self.n:
+            raise ValueError("Right-hand side must have as many rows as the matrix")
+        rows = self._rows
+        y = [list(b[p]) for p in self.pivots]
+        for i in range(self.n):
+            row = rows[i]
+            for j in range(i):
+                factor = row[j]
+                if factor:
+                    y[i] = [a - factor * c for a, c in zip(y[i], y[j])]
+        for i in reversed(range(self.n)):
+            row = rows[i]
+            for j in range(i + 1, self.n):
+                factor = row[j]
+                if factor:
+                    y[i] = [a - factor * c for a, c in zip(y[i], y[j])]
+            pivot = row[i]
+            y[i] = [a / pivot for a in y[i]]
+        return y
+
+    def solve(self, b: Union[Matrix, List[float]]) -> Union[Matrix, List[float]]:
+        """Решить A x = b для вектора-списка или матрицы правых частей"""
+        if isinstance(b, Matrix):
+            return Matrix(self._solve_rows(b.to_list()))
+        return [row[0] for row in self._solve_rows([[x] for x in b])]
+
+    def inverse(self) -> Matrix:
+        """Обратная матрица: решение A X = I"""
+        identity = [[1.0 if i == j else 0.0 for j in range(self.n)] for i in range(self.n)]
+        return Matrix(self._solve_rows(identity))
+
+
+# Точный определитель для целых и Fraction. Метод Bareiss исключает без дробей:
+# каждое промежуточное значение - минор исходной матрицы, поэтому его длина
+# ограничена оценкой Адамара. Модульный метод считает определитель по нескольким
+# простым модулям и восстанавливает его по китайской теореме об остатках; в CPython
+# длинная арифметика Bareiss обычно быстрее, поэтому модульный метод выбирается явно.
+DETERMINANT_METHODS = ('auto', 'lu', 'bareiss', 'modular')
+# Основания Миллера-Рабина, дающие точный ответ для всех чисел меньше 3.3 * 10^24
+_PRIME_TEST_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_modular_primes: List[int] = []
+
+
+def _is_prime(n: int) -> bool:
+    """Детерминированный тест Миллера-Рабина для n < 3.3 * 10^24"""
+    if n < 2:
+        return False
+    for p in _PRIME_TEST_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in _PRIME_TEST_BASES:
+        x = pow(base, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
         else:
-            # Рекурсивное вычисление для матриц большего порядка
-            det = 0
-            for j in range(self.cols):
-                minor = []
-                for i in range(1, self.rows):
-                    row = []
-                    for k in range(self.cols):
-                        if k != j:
-                            row.append(self._data[i][k])
-                    minor.append(row)
-                det += ((-1) ** j) * self._data[0][j] * Matrix(minor).determinant()
-            return det
+            return False
+    return True
+
+
+def _modular_prime(index: int) -> int:
+    """index-е по убыванию простое число, не превосходящее 2^61 - 1 (список кэшируется)"""
+    candidate = _modular_primes[-1] - 2 if _modular_primes else (1 << 61) - 1
+    while len(_modular_primes) <= index:
+        if _is_prime(candidate):
+            _modular_primes.append(candidate)
+        candidate -= 2
+    return _modular_primes[index]
+
+
+def _bareiss(a: List[List[int]]) -> int:
+    """Определитель целочисленной матрицы методом Bareiss: O(n^3) точных делений"""
+    n = len(a)
+    m = [row[:] for row in a]
+    sign = 1
+    previous = 1
+    for k in range(n - 1):
+        if m[k][k] == 0:
+            swap = next((i for i in range(k + 1, n) if m[i][k] != 0), None)
+            if swap is None:
+                return 0
+            m[k], m[swap] = m[swap], m[k]
+            sign = -sign
+        pivot_row = m[k]
+        pivot = pivot_row[k]
+        for i in range(k + 1, n):
+            row = m[i]
+            factor = row[k]
+            # Деление на предыдущий ведущий элемент всегда нацело
+            row[k + 1:] = [(pivot * x - factor * y) // previous
+                           for x, y in zip(row[k + 1:], pivot_row[k + 1:])]
+        previous = pivot
+    return sign * m[n - 1][n - 1]
+
+
+def _determinant_mod(a: List[List[int]], p: int) -> int:
+    """Определитель по простому модулю p (исключение Гаусса в поле вычетов)"""
+    n = len(a)
+    m = [[x % p for x in row] for row in a]
+    det = 1
+    for k in range(n):
+        swap = next((i for i in range(k, n) if m[i][k]), None)
+        if swap is None:
+            return 0
+        if swap != k:
+            m[k], m[swap] = m[swap], m[k]
+            det = -det
+        pivot_row = m[k]
+        det = det * pivot_row[k] % p
+        inverse = pow(pivot_row[k], -1, p)
+        for i in range(k + 1, n):
+            row = m[i]
+            factor = row[k] * inverse % p
+            if factor:
+                row[k + 1:] = [(x - factor * y) % p for x, y in zip(row[k + 1:], pivot_row[k + 1:])]
+    return det % p
+
+
+def _determinant_modular(a: List[List[int]]) -> int:
+    """Определитель по нескольким простым модулям с восстановлением по КТО"""
+    # Оценка Адамара: |det| <= произведение длин строк
+    bound = 1
+    for row in a:
+        bound *= math.isqrt(sum(x * x for x in row)) + 1
+    residue, modulus = 0, 1
+    index = 0
+    while modulus <= 2 * bound:
+        p = _modular_prime(index)
+        index += 1
+        step = (_determinant_mod(a, p) - residue) * pow(modulus, -1, p) % p
+        residue += modulus * step
+        modulus *= p
+    # Симметричный вычет: определитель может быть отрицательным
+    return residue - modulus if residue > modulus // 2 else residue
+
+
+def _as_exact(x: Number) -> Union[int, Fraction]:
+    """Точное значение элемента: float переводится в int или Fraction без потерь"""
+    if isinstance(x, (int, Fraction)):
+        return x
+    x = float(x)
+    return int(x) if x.is_integer() else Fraction(x)
+
+
+def _exact_determinant(a: List[List[Number]], method: str = 'bareiss') -> Union[int, Fraction]:
+    """Точный определитель: строки с дробями приводятся к общему знаменателю"""
+    if not a:
+        return 1
+    values = [[_as_exact(x) for x in row] for row in a]
+    scale = 1
+    rows = []
+    for row in values:
+        common = math.lcm(*(x.denominator for x in row))
+        scale *= common
+        rows.append([int(x * common) for x in row])
+    det = _determinant_modular(rows) if method == 'modular' else _bareiss(rows)
+    if any(isinstance(x, Fraction) for row in values for x in row):
+        return Fraction(det, scale)
+    return det
+
+
+# Степени матрицы: размер LRU-кэша степеней у каждой матрицы и методы
+POWER_CACHE_SIZE = 32
+POWER_METHODS = ('auto', 'squaring', 'eigen')
+# Метод Якоби останавливается, когда внедиагональная часть становится
+# пренебрежимо малой относительно всей матрицы
+JACOBI_TOLERANCE = 1e-30
+JACOBI_MAX_SWEEPS = 100
+
+
+def _identity(n: int) -> array:
+    result = _zeros(n * n)
+    result[::n + 1] = array('d', repeat(1.0, n))
+    return result
+
+
+def _jacobi_eigen(a: List[List[float]]) -> Tuple[List[float], List[List[float]]]:
+    """Собственные значения и векторы (по столбцам) симметричной матрицы методом вращений Якоби"""
+    n = len(a)
+    a = [row[:] for row in a]
+    v = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    total = sum(x * x for row in a for x in row)
+    for _ in range(JACOBI_MAX_SWEEPS):
+        off = sum(a[p][q] ** 2 for p in range(n) for q in range(p + 1, n))
+        if off <= JACOBI_TOLERANCE * total:
+            break
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if a[p][q] == 0.0:
+                    continue
+                # Вращение в плоскости (p, q), обнуляющее a[p][q]
+                theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+                t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+                for row in a:
+                    row[p], row[q] = c * row[p] - s * row[q], s * row[p] + c * row[q]
+                a[p], a[q] = ([c * x - s * y for x, y in zip(a[p], a[q])],
+                              [s * x + c * y for x, y in zip(a[p], a[q])])
+                for row in v:
+                    row[p], row[q] = c * row[p] - s * row[q], s * row[p] + c * row[q]
+    return [a[i][i] for i in range(n)], v
+
+
+# Слагаемое линейной комбинации при вычислении ленивого выражения:
+# (коэффициент, матрица, читать ли её транспонированной)
+_Term = Tuple[Number, Matrix, bool]
+
+
+class LazyMatrix:
+    """Узел ленивого выражения над Matrix.
+
+    +, умножение на скаляр, transpose() и умножение матриц только строят
+    дерево. evaluate() (или любое обращение к данным) вычисляет его: цепочки
+    поэлементных операций сливаются в один проход без промежуточных матриц,
+    а транспонирование операндов умножения превращается в порядок чтения.
+    """
+
+    __slots__ = ('rows', 'cols', '_op', '_args', '_value')
+
+    def __init__(self, matrix: Matrix) -> None:
+        self.rows = matrix.rows
+        self.cols = matrix.cols
+        self._op = 'leaf'
+        self._args: Tuple[Any, ...] = (matrix,)
+        self._value: Optional[Matrix] = None
+
+    @classmethod
+    def _node(cls, op: str, rows: int, cols: int, *args: Any) -> 'LazyMatrix':
+        node = cls.__new__(cls)
+        node.rows = rows
+        node.cols = cols
+        node._op = op
+        node._args = args
+        node._value = None
+        return node
+
+    @staticmethod
+    def _wrap(other: Any) -> Optional['LazyMatrix']:
+        if isinstance(other, LazyMatrix):
+            return other
+        if isinstance(other, Matrix):
+            return LazyMatrix(other)
+        return None
+
+    def __add__(self, other: Union['LazyMatrix', Matrix]) -> 'LazyMatrix':
+        """Отложенное сложение"""
+        other = self._wrap(other)
+        if other is None:
+            return NotImplemented
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        return LazyMatrix._node('add', self.rows, self.cols, self, other)
+
+    __radd__ = __add__
+
+    def __mul__(self, other: Union['LazyMatrix', Matrix, Number]) -> 'LazyMatrix':
+        """Отложенное умножение на скаляр или на матрицу"""
+        if isinstance(other, Number):
+            return LazyMatrix._node('scale', self.rows, self.cols, self, other)
+        other = self._wrap(other)
+        if other is None:
+            return NotImplemented
+        if self.cols != other.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second")
+        return LazyMatrix._node('matmul', self.rows, other.cols, self, other)
+
+    def __rmul__(self, other: Union[Matrix, Number]) -> 'LazyMatrix':
+        if isinstance(other, Number):
+            return self * other
+        other = self._wrap(other)
+        if other is None:
+            return NotImplemented
+        return other * self
+
+    def transpose(self) -> 'LazyMatrix':
+        """Отложенное транспонирование"""
+        return LazyMatrix._node('transpose', self.cols, self.rows, self)
+
+    def _terms(self) -> List[_Term]:
+        """Разложить узел в линейную комбинацию уже вычисленных матриц"""
+        terms: List[_Term] = []
+        # Обход без рекурсии: длинные цепочки a + b + c + ... не упираются в стек
+        stack: List[Tuple['LazyMatrix', Number, bool]] = [(self, 1, False)]
+        while stack:
+            node, coef, flipped = stack.pop()
+            op, args = node._op, node._args
+            if node._value is not None or op == 'leaf':
+                matrix, transposed = (node._value if node._value is not None else args[0])._oriented()
+                terms.append((coef, matrix, flipped != transposed))
+            elif op == 'add':
+                stack.append((args[1], coef, flipped))
+                stack.append((args[0], coef, flipped))
+            elif op == 'scale':
+                stack.append((args[0], coef * args[1], flipped))
+            elif op == 'transpose':
+                stack.append((args[0], coef, not flipped))
+            else:
+                # Умножение: скаляры выносятся, транспонирование операндов уходит в порядок чтения
+                (ca, a, ta), = self._single_term(args[0])
+                (cb, b, tb), = self._single_term(args[1])
+                terms.append((coef * ca * cb, _multiply_oriented(a, ta, b, tb), flipped))
+        return terms
+
+    @staticmethod
+    def _single_term(node: 'LazyMatrix') -> List[_Term]:
+        terms = node._terms()
+        if len(terms) == 1:
+            return terms
+        return [(1, _combine(terms, node.rows, node.cols), False)]
+
+    def evaluate(self) -> Matrix:
+        """Вычислить выражение (результат кэшируется в узле)"""
+        if self._value is None:
+            if self._op == 'leaf':
+                self._value = self._args[0]
+                return self._value
+            terms = self._terms()
+            if self._op == 'matmul' and terms[0][0] == 1:
+                # Свежий результат умножения - копировать незачем
+                self._value = terms[0][1]
+            else:
+                self._value = _combine(terms, self.rows, self.cols)
+            # Поддерево больше не нужно
+            self._op, self._args = 'leaf', (self._value,)
+        return self._value
+
+    def __getattr__(self, name: str) -> Any:
+        # Любое обращение к данным (to_list, determinant, buffer, ...) вычисляет выражение
+        return getattr(self.evaluate(), name)
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        return self.evaluate()[index]
 
     def __str__(self) -> str:
-        return '\n'.join([' '.join(f'{elem:6.1f}' for elem in row) for row in self._data])
+        return str(self.evaluate())
 
     def __repr__(self) -> str:
-        return f"Matrix({self._data})"
+        return f"LazyMatrix({self._op}, {self.rows}x{self.cols})"
+
+
+def _element_stream(matrix: Matrix, flipped: bool) -> Iterable[float]:
+    """Элементы матрицы (или транспонированной) в построчном порядке, без копии целиком"""
+    if not flipped:
+        return matrix._data
+    cols = matrix.cols
+    return chain.from_iterable(matrix._data[j::cols] for j in range(cols))
+
+
+def _combine(terms: List[_Term], rows: int, cols: int) -> Matrix:
+    """Слить линейную комбинацию в один проход по элементам"""
+    merged: Dict[Tuple[int, bool], List[Any]] = {}
+    for coef, matrix, flipped in terms:
+        # Виды одного массива сливаются в одно слагаемое
+        key = (id(matrix._data), flipped)
+        if key in merged:
+            merged[key][0] += coef
+        else:
+            merged[key] = [coef, matrix, flipped]
+    stream = None
+    for coef, matrix, flipped in merged.values():
+        values = _element_stream(matrix, flipped)
+        if coef != 1:
+            values = map(mul, values, repeat(coef))
+        stream = values if stream is None else map(add, stream, values)
+    return Matrix._from_flat(rows, cols, array('d', stream))
+
 
+def _multiply_oriented(a: Matrix, a_flipped: bool, b: Matrix, b_flipped: bool) -> Matrix:
+    """Произведение op(a) * op(b), где op - транспонирование по флагу, без копии транспонированных"""
+    if a_flipped:
+        rows, inner = a.cols, a.rows
+        left = [a._data[i::a.cols] for i in range(a.cols)]
+    else:
+        rows, inner = a.rows, a.cols
+        left = [a._data[i * a.cols:(i + 1) * a.cols] for i in range(a.rows)]
+    if b_flipped:
+        # Столбцы b^T - это строки b, они уже непрерывны
+        cols = b.rows
+        right = [b._data[j * b.cols:(j + 1) * b.cols] for j in range(b.rows)]
+    else:
+        cols = b.cols
+        right = [b._data[j::b.cols] for j in range(b.cols)]
+    result = array('d')
+    for row in left:
+        result.extend([sum(map(mul, row, column)) for column in right])
+    return Matrix._from_flat(rows, cols, result)
+
+
+# Параллельное выполнение. Задачи получают имена блоков разделяемой памяти
+# и диапазон строк (или элементов) результата, который они заполняют.
+PARALLEL_THRESHOLD = 1 << 18
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    return shared_memory.SharedMemory(name=name)
+
+
+def _read_doubles(block: shared_memory.SharedMemory, start: int, stop: int) -> array:
+    """Скопировать элементы [start, stop) блока в локальный array('d')"""
+    result = array('d')
+    result.frombytes(block.buf[8 * start:8 * stop])
+    return result
+
+
+def _write_doubles(block: shared_memory.SharedMemory, start: int, values: array) -> None:
+    block.buf[8 * start:8 * (start + len(values))] = values.tobytes()
+
+
+def _task_matmul(names: List[str], out_name: str, inner: int, cols: int,
+                 first: int, last: int, strategy: str) -> None:
+    """Строки [first, last) произведения"""
+    a_block, b_block, out = _attach(names[0]), _attach(names[1]), _attach(out_name)
+    try:
+        a = _read_doubles(a_block, first * inner, last * inner)
+        b = _read_doubles(b_block, 0, inner * cols)
+        _write_doubles(out, first * cols, _MULTIPLY_ENGINES[strategy](a, b, last - first, inner, cols))
+    finally:
+        for block in (a_block, b_block, out):
+            block.close()
+
+
+def _task_add(names: List[str], out_name: str, first: int, last: int) -> None:
+    """Элементы [first, last) суммы"""
+    a_block, b_block, out = _attach(names[0]), _attach(names[1]), _attach(out_name)
+    try:
+        values = array('d', map(add, _read_doubles(a_block, first, last), _read_doubles(b_block, first, last)))
+        _write_doubles(out, first, values)
+    finally:
+        for block in (a_block, b_block, out):
+            block.close()
+
+
+def _task_scale(names: List[str], out_name: str, factor: Number, first: int, last: int) -> None:
+    """Элементы [first, last) произведения на скаляр"""
+    a_block, out = _attach(names[0]), _attach(out_name)
+    try:
+        _write_doubles(out, first, array('d', map(mul, _read_doubles(a_block, first, last), repeat(factor))))
+    finally:
+        a_block.close()
+        out.close()
+
+
+def _task_transpose(names: List[str], out_name: str, rows: int, cols: int, first: int, last: int) -> None:
+    """Строки [first, last) транспонированной матрицы (столбцы исходной)"""
+    a_block, out = _attach(names[0]), _attach(out_name)
+    try:
+        a = _read_doubles(a_block, 0, rows * cols)
+        result = array('d')
+        for j in range(first, last):
+            result.extend(a[j::cols])
+        _write_doubles(out, first * rows, result)
+    finally:
+        a_block.close()
+        out.close()
+
+
+class ParallelExecutor:
+    """Пул процессов для больших матричных операций.
+
+    Операнды передаются через multiprocessing.shared_memory, результат делится
+    на блоки строк (или элементов) по числу рабочих. Внутри with-блока
+    исполнитель становится активным: операторы Matrix (+, *, копирование видов transpose())
+    сами уходят в пул, если матрица больше threshold элементов.
+    """
+
+    _stack: List['ParallelExecutor'] = []
+
+    def __init__(self, workers: Optional[int] = None, threshold: int = PARALLEL_THRESHOLD) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def active(cls) -> Optional['ParallelExecutor']:
+        """Исполнитель ближайшего объемлющего with-блока"""
+        return cls._stack[-1] if cls._stack else None
+
+    def __enter__(self) -> 'ParallelExecutor':
+        ParallelExecutor._stack.append(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        ParallelExecutor._stack.remove(self)
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Остановить процессы пула"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def worth_it(self, work: int) -> bool:
+        """Стоит ли распараллеливать операцию такого объёма"""
+        return self.workers > 1 and work >= self.threshold
+
+    def _ranges(self, total: int) -> List[Tuple[int, int]]:
+        """Разбить [0, total) на непустые блоки - по два на рабочего для балансировки"""
+        parts = max(1, min(total, 2 * self.workers))
+        bounds = [total * p // parts for p in range(parts + 1)]
+        return [(bounds[p], bounds[p + 1]) for p in range(parts) if bounds[p] < bounds[p + 1]]
+
+    def _run(self, task: Callable[..., None], inputs: List[array], out_len: int,
+             jobs: List[Tuple[Any, ...]]) -> array:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        blocks = []
+        try:
+            for data in inputs:
+                block = shared_memory.SharedMemory(create=True, size=max(8, 8 * len(data)))
+                blocks.append(block)
+                block.buf[:8 * len(data)] = data.tobytes()
+            out = shared_memory.SharedMemory(create=True, size=max(8, 8 * out_len))
+            blocks.append(out)
+            names = [block.name for block in blocks[:-1]]
+            futures = [self._pool.submit(task, names, out.name, *job) for job in jobs]
+            for future in futures:
+                future.result()
+            return _read_doubles(out, 0, out_len)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def matmul(self, a: Matrix, b: Matrix, strategy: str = 'auto') -> Matrix:
+        """Произведение матриц по блокам строк"""
+        if a.cols != b.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second")
+        if strategy == 'auto':
+            strategy = _choose_multiply_strategy(a.rows, a.cols, b.cols)
+        jobs = [(a.cols, b.cols, first, last, strategy) for first, last in self._ranges(a.rows)]
+        result = self._run(_task_matmul, [a._row_major(), b._row_major()], a.rows * b.cols, jobs)
+        return Matrix._from_flat(a.rows, b.cols, result)
+
+    def add(self, a: Matrix, b: Matrix) -> Matrix:
+        """Поэлементная сумма по блокам"""
+        if a.rows != b.rows or a.cols != b.cols:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        jobs = self._ranges(len(a._data))
+        inputs = [a._row_major(), b._row_major()]
+        return Matrix._from_flat(a.rows, a.cols, self._run(_task_add, inputs, len(a._data), jobs))
+
+    def scale(self, a: Matrix, factor: Number) -> Matrix:
+        """Умножение на скаляр по блокам"""
+        jobs = [(factor, first, last) for first, last in self._ranges(len(a._data))]
+        return Matrix._from_flat(a.rows, a.cols, self._run(_task_scale, [a._row_major()], len(a._data), jobs))
+
+    def transpose(self, a: Matrix) -> Matrix:
+        """Транспонирование по блокам строк результата"""
+        jobs = [(a.rows, a.cols, first, last) for first, last in self._ranges(a.cols)]
+        return Matrix._from_flat(a.cols, a.rows, self._run(_task_transpose, [a._row_major()], len(a._data), jobs))
+
+
+# Бинарный формат файла: заголовок (сигнатура, версия, тип элементов 'd',
+# порядок 'C' - построчно, порядок байт, rows, cols) и сразу за ним
+# rows * cols чисел double без разделителей.
+_FILE_HEADER = struct.Struct('<4sBcccQQ')
+_FILE_MAGIC = b'MTRX'
+_FILE_VERSION = 1
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+# Память под плитки при умножении файлов по умолчанию, байт
+OUT_OF_CORE_BUDGET = 64 << 20
+# Байт на столбец плитки сверх самих данных: вид memoryview, сумма и ссылки на них
+_TILE_COLUMN_OVERHEAD = 256
+
+
+def _map_file(path: str, writable: bool = False) -> Tuple[mmap.mmap, int, int]:
+    """Отобразить файл матрицы в память и проверить заголовок"""
+    with open(path, 'r+b' if writable else 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < _FILE_HEADER.size:
+            raise ValueError(f"{path} is not a matrix file")
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    magic, version, dtype, layout, byte_order, rows, cols = _FILE_HEADER.unpack_from(mapping)
+    if magic != _FILE_MAGIC or version != _FILE_VERSION:
+        mapping.close()
+        raise ValueError(f"{path} is not a matrix file")
+    if dtype != b'd' or layout != b'C' or byte_order != _BYTE_ORDER:
+        mapping.close()
+        raise ValueError(f"Unsupported matrix file {path}: dtype {dtype!r}, layout {layout!r}, "
+                         f"byte order {byte_order!r}")
+    if size < _FILE_HEADER.size + 8 * rows * cols:
+        mapping.close()
+        raise ValueError(f"{path} is truncated")
+    return mapping, rows, cols
+
+
+def multiply_to(path_a: str, path_b: str, out_path: str, memory_budget: int = OUT_OF_CORE_BUDGET) -> Matrix:
+    """Умножить матрицы из файлов save(), не загружая их целиком.
+
+    Результат пишется в out_path плитками tile x tile. В памяти одновременно
+    лежат только плитка A, плитка B и накопитель (плюс строка-другая
+    временных значений): произведение плиток прибавляется к накопителю на месте,
+    а столбцы B берутся через срезы memoryview без копирования. tile подбирается
+    так, чтобы три плитки укладывались в memory_budget байт.
+    Возвращает результат, открытый через Matrix.open.
+    """
+    map_a, rows, inner = _map_file(path_a)
+    map_b, inner_b, cols = _map_file(path_b)
+    if inner != inner_b:
+        map_a.close()
+        map_b.close()
+        raise ValueError("Number of columns in first matrix must equal number of rows in second")
+    with open(out_path, 'wb') as file:
+        file.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, b'd', b'C', _BYTE_ORDER, rows, cols))
+        file.truncate(_FILE_HEADER.size + 8 * rows * cols)
+    map_out = _map_file(out_path, writable=True)[0]
+    start = _FILE_HEADER.size
+    # Плитки читаются из отображений побайтно (frombytes), без разбора по элементам
+    a_bytes, b_bytes = memoryview(map_a)[start:], memoryview(map_b)[start:]
+    out = memoryview(map_out)[start:start + 8 * rows * cols].cast('d')
+    # Три плитки по 8 байт на элемент плюс по виду memoryview и сумме на столбец плитки
+    tile = max(1, math.isqrt(memory_budget // 24))
+    while tile > 1 and 24 * tile * tile + _TILE_COLUMN_OVERHEAD * tile > memory_budget:
+        tile -= 1
+    # Плитки и накопитель создаются один раз и переиспользуются на каждом шаге
+    a_tile, b_tile, acc = array('d'), array('d'), array('d')
+    try:
+        for i0 in range(0, rows, tile):
+            i1 = min(rows, i0 + tile)
+            for j0 in range(0, cols, tile):
+                j1 = min(cols, j0 + tile)
+                width = j1 - j0
+                # Плитки прошлого шага освобождаются до обнуления накопителя
+                del acc[:], a_tile[:], b_tile[:]
+                acc.frombytes(bytes(8 * (i1 - i0) * width))
+                for k0 in range(0, inner, tile):
+                    k1 = min(inner, k0 + tile)
+                    del a_tile[:], b_tile[:]
+                    for i in range(i0, i1):
+                        a_tile.frombytes(a_bytes[8 * (i * inner + k0):8 * (i * inner + k1)])
+                    for k in range(k0, k1):
+                        b_tile.frombytes(b_bytes[8 * (k * cols + j0):8 * (k * cols + j1)])
+                    _multiply_add(a_tile, b_tile, acc, i1 - i0, k1 - k0, width)
+                for i in range(i0, i1):
+                    row = (i - i0) * width
+                    out[i * cols + j0:i * cols + j1] = acc[row:row + width]
+        map_out.flush()
+    finally:
+        for view in (a_bytes, b_bytes, out):
+            view.release()
+        for mapping in (map_a, map_b, map_out):
+            mapping.close()
+    return Matrix.open(out_path)
+
+
+def _multiply_add(a: array, b: array, acc: array, rows: int, inner: int, cols: int) -> None:
+    """acc += a @ b на месте; столбцы b - срезы memoryview с шагом, без копий"""
+    a_view, b_view = memoryview(a), memoryview(b)
+    try:
+        columns = [b_view[j::cols] for j in range(cols)]
+        for i in range(rows):
+            row = a_view[i * inner:(i + 1) * inner]
+            base = i * cols
+            acc[base:base + cols] = array('d', map(add, acc[base:base + cols],
+                                                   [sum(map(mul, row, column)) for column in columns]))
+            row.release()
+        for column in columns:
+            column.release()
+    finally:
+        a_view.release()
+        b_view.release()
+
+
+# Бэкенд NumPy: данные Matrix уже лежат в array('d'), поэтому np.frombuffer
+# смотрит на них без копирования (вид transpose() - через .T), а результат
+# возвращается одним memcpy или сразу пишется в хранилище out.
+if np is not None:
+    def _as_ndarray(matrix: Matrix) -> Any:
+        values = np.frombuffer(matrix._data, dtype=np.float64)
+        if matrix._contiguous():
+            return values.reshape(matrix.rows, matrix.cols)
+        return values.reshape(matrix.cols, matrix.rows).T
+
+    def _from_ndarray(values: Any) -> Matrix:
+        rows, cols = values.shape
+        return Matrix._from_flat(rows, cols, array('d', np.ascontiguousarray(values, dtype=np.float64).tobytes()))
+
+    def _numpy_operation(ufunc: Callable[..., Any]) -> Callable[..., Matrix]:
+        def operation(a: Matrix, b: Any, out: Optional[Matrix] = None) -> Matrix:
+            b = _as_ndarray(b) if isinstance(b, Matrix) else b
+            if out is None:
+                return _from_ndarray(ufunc(_as_ndarray(a), b))
+            ufunc(_as_ndarray(a), b, out=_as_ndarray(out))
+            return out
+        return operation
+
+    register_backend('numpy', {
+        'add': _numpy_operation(np.add),
+        'scale': _numpy_operation(np.multiply),
+        'matmul': _numpy_operation(np.matmul),
+        'transpose': lambda a: _from_ndarray(_as_ndarray(a).T),
+        'determinant': lambda a: float(np.linalg.det(_as_ndarray(a))),
+    })
+    set_backend('numpy')
 
 
 if __name__ == "__main__":
@@ -114,8 +1445,8 @@ if __name__ == "__main__":
     m1 = Matrix([[1, 2], [2, 3]])
     m2 = Matrix([[2, 5], [7, 9]])
 
-    print("m1 =", m1._data)
-    print("m2 =", m2._data)
+    print("m1 =", m1.to_list())
+    print("m2 =", m2.to_list())
 
     m3 = m1 + m2
     m4 = m1 * m2
@@ -123,8 +1454,71 @@ if __name__ == "__main__":
     det = m1.determinant()
 
     print("\n--- Результаты операций ---")
-    print("m1 + m2 =", m3._data)
-    print("m1 * m2 =", m4._data)
-    print("m1.transpose() =", m5._data)
+    print("m1 + m2 =", m3.to_list())
+    print("m1 * m2 =", m4.to_list())
+    print("m1.transpose() =", m5.to_list())
     print("m1.determinant() =", det)
 
+    print("\n--- LU-разложение ---")
+    a = Matrix([[2, 1, 1, 0], [4, 3, 3, 1], [8, 7, 9, 5], [6, 7, 9, 8]])
+    print("det(a) =", a.determinant())
+    print("a.solve([1, 2, 3, 4]) =", [round(x, 6) for x in a.solve([1, 2, 3, 4])])
+    print("a * a.inverse() =", [[round(x, 6) + 0.0 for x in row] for row in (a * a.inverse()).to_list()])
+
+    print("\n--- Параллельное выполнение ---")
+    with ParallelExecutor(workers=2, threshold=0):
+        print("m1 * m2 (в пуле) =", (m1 * m2).to_list())
+
+    print("\n--- Бэкенды ---")
+    print("Бэкенд умножения:", get_backend('matmul'))
+
+    print("\n--- Ленивые выражения ---")
+    expression = (m1.lazy() + m2) * 3 + m1.transpose().lazy() * m2
+    print("Выражение:", repr(expression))
+    print("Результат:", expression.evaluate().to_list())
+
+    print("\n--- Операции на месте и виды ---")
+    x = Matrix([[1, 0], [0, 1]])
+    step = Matrix([[0, 0], [0, 0]])
+    for _ in range(3):
+        # Результат пишется в заранее выделенные матрицы
+        m1.multiply(x, out=step)
+        x += step
+        x *= 0.5
+    print("x =", x.to_list())
+    view = m2.transpose()
+    print("m2.transpose() делит данные с m2:", view._data is m2._data)
+    view += m1
+    print("После записи вид скопирован:", view._data is m2._data, view.to_list(), m2.to_list())
+
+    print("\n--- Файлы и умножение вне памяти ---")
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path_a, path_b = os.path.join(directory, 'a.mtx'), os.path.join(directory, 'b.mtx')
+        a.save(path_a)
+        a.inverse().save(path_b)
+        print("Matrix.open(a.mtx) =", Matrix.open(path_a).to_list())
+        product = multiply_to(path_a, path_b, os.path.join(directory, 'c.mtx'), memory_budget=100)
+        print("a * a^-1 по плиткам =", [[round(x, 6) + 0.0 for x in row] for row in product.to_list()])
+
+    print("\n--- Точный определитель ---")
+    # Матрица Вандермонда: определитель - произведение разностей узлов, равен 12
+    vandermonde = Matrix([[(1000 + i) ** j for j in range(4)] for i in range(4)])
+    print("det (float) =", vandermonde.determinant())
+    print("det ('bareiss') =", vandermonde.determinant('bareiss'))
+    print("det ('modular') =", vandermonde.determinant('modular'))
+
+    print("\n--- Степени матрицы ---")
+    fibonacci = Matrix([[1, 1], [1, 0]])
+    print("fibonacci ** 10 =", (fibonacci ** 10).to_list())
+    print("fibonacci ** 20 (из кэша степеней) =", (fibonacci ** 20).to_list())
+    print("fibonacci.power(10, 'eigen') =", [[round(x, 6) for x in row] for row in fibonacci.power(10, 'eigen').to_list()])
+    print("fibonacci ** -2 =", (fibonacci ** -2).to_list())
+
+    print("\n--- Запись через buffer() ---")
+    b = Matrix([[2, 1, 1, 0], [4, 3, 3, 1], [8, 7, 9, 5], [6, 7, 9, 8]])
+    print("det(b) =", b.determinant(), " b ** 2 [0, 0] =", (b ** 2)[0, 0])
+    b.buffer()[0, 0] = 100
+    # Кэши LU и степеней не должны пережить запись в обход матрицы
+    print("После записи: det(b) =", b.determinant(), " b ** 2 [0, 0] =", (b ** 2)[0, 0])
+    print("b.solve([1, 2, 3, 4]) =", [round(x, 6) for x in b.solve([1, 2, 3, 4])])
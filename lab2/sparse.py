@@ -0,0 +1,325 @@
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from numbers import Number
+from operator import mul
+from typing import Dict, Iterable, List, Tuple, Union
+
+from oop import Matrix
+
+# Результат с большей долей ненулевых элементов возвращается плотной матрицей
+DENSE_FILL_RATIO = 0.25
+
+
+class COOBuilder:
+    """Построитель разреженной матрицы из троек (строка, столбец, значение)"""
+
+    def __init__(self, rows: int, cols: int) -> None:
+        self.rows = rows
+        self.cols = cols
+        self._row_ids = array('q')
+        self._col_ids = array('q')
+        self._values = array('d')
+
+    def add(self, i: int, j: int, value: float) -> None:
+        """Добавить элемент (повторы одной позиции суммируются)"""
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError(f"Index ({i}, {j}) is out of range for a {self.rows}x{self.cols} matrix")
+        self._row_ids.append(i)
+        self._col_ids.append(j)
+        self._values.append(value)
+
+    def build(self) -> 'SparseMatrix':
+        """Собрать CSR: тройки копятся по строкам в словарях {столбец: сумма},
+        затем столбцы каждой строки упорядочиваются через sorted.
+
+        Встроенная sorted здесь быстрее сортировки подсчётом на чистом Python.
+        """
+        rows: List[Dict[int, float]] = [{} for _ in range(self.rows)]
+        for i, j, value in zip(self._row_ids, self._col_ids, self._values):
+            row = rows[i]
+            row[j] = row.get(j, 0.0) + value
+        return SparseMatrix._from_rows(self.rows, self.cols, rows)
+
+
+class SparseMatrix:
+    """Разреженная матрица в формате CSR
+
+    Ненулевые элементы строки i - это values[indptr[i]:indptr[i + 1]]
+    в столбцах indices[indptr[i]:indptr[i + 1]] (по возрастанию).
+    """
+
+    __slots__ = ('rows', 'cols', 'indptr', 'indices', 'values')
+
+    def __init__(self, rows: int, cols: int, indptr: array, indices: array, values: array) -> None:
+        if len(indptr) != rows + 1 or len(indices) != len(values) or indptr[-1] != len(values):
+            raise ValueError("Inconsistent CSR arrays")
+        self.rows = rows
+        self.cols = cols
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+
+    @classmethod
+    def _from_rows(cls, rows: int, cols: int, data: List[Dict[int, float]]) -> 'SparseMatrix':
+        """Собрать CSR из словарей {столбец: значение} по строкам, отбросив нули"""
+        indptr = array('q', [0])
+        indices = array('q')
+        values = array('d')
+        for row in data:
+            for j in sorted(row):
+                if row[j]:
+                    indices.append(j)
+                    values.append(row[j])
+            indptr.append(len(values))
+        return cls(rows, cols, indptr, indices, values)
+
+    @classmethod
+    def from_coo(cls, rows: int, cols: int, entries: Iterable[Tuple[int, int, float]]) -> 'SparseMatrix':
+        """Создать матрицу из троек (строка, столбец, значение)"""
+        builder = COOBuilder(rows, cols)
+        for i, j, value in entries:
+            builder.add(i, j, value)
+        return builder.build()
+
+    @classmethod
+    def from_dense(cls, matrix: Union[Matrix, List[List[float]]]) -> 'SparseMatrix':
+        """Создать разреженную матрицу из плотной (Matrix или вложенных списков)"""
+        if not isinstance(matrix, Matrix):
+            matrix = Matrix(matrix)
+        cols = matrix.cols
+        data = matrix._row_major()
+        rows = [{j: data[i * cols + j] for j in range(cols) if data[i * cols + j]} for i in range(matrix.rows)]
+        return cls._from_rows(matrix.rows, cols, rows)
+
+    def _row(self, i: int) -> Tuple[array, array]:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.values[start:end]
+
+    def _row_dict(self, i: int) -> Dict[int, float]:
+        return dict(zip(*self._row(i)))
+
+    @property
+    def nnz(self) -> int:
+        """Число хранимых ненулевых элементов"""
+        return len(self.values)
+
+    def density(self) -> float:
+        """Доля ненулевых элементов"""
+        size = self.rows * self.cols
+        return self.nnz / size if size else 0.0
+
+    def to_dense(self) -> Matrix:
+        """Преобразовать в плотную Matrix"""
+        data = array('d', bytes(8 * self.rows * self.cols))
+        for i in range(self.rows):
+            base = i * self.cols
+            for j, value in zip(*self._row(i)):
+                data[base + j] = value
+        return Matrix._from_flat(self.rows, self.cols, data)
+
+    def to_list(self) -> List[List[float]]:
+        """Экспорт во вложенные списки"""
+        return self.to_dense().to_list()
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        i, j = index
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError(f"Index {index} is out of range for a {self.rows}x{self.cols} matrix")
+        start, end = self.indptr[i], self.indptr[i + 1]
+        pos = bisect_left(self.indices, j, start, end)
+        return self.values[pos] if pos < end and self.indices[pos] == j else 0.0
+
+    def transpose(self) -> 'SparseMatrix':
+        """Транспонирование: CSR этой матрицы становится CSC, то есть CSR транспонированной"""
+        counts = [0] * (self.cols + 1)
+        for j in self.indices:
+            counts[j + 1] += 1
+        for j in range(self.cols):
+            counts[j + 1] += counts[j]
+        indptr = array('q', counts)
+        indices = array('q', bytes(8 * self.nnz))
+        values = array('d', bytes(8 * self.nnz))
+        position = counts[:-1]
+        for i in range(self.rows):
+            for j, value in zip(*self._row(i)):
+                dest = position[j]
+                indices[dest] = i
+                values[dest] = value
+                position[j] = dest + 1
+        return SparseMatrix(self.cols, self.rows, indptr, indices, values)
+
+    def __add__(self, other: Union['SparseMatrix', Matrix]) -> Union['SparseMatrix', Matrix]:
+        """Сложение с разреженной или плотной матрицей"""
+        if not isinstance(other, (SparseMatrix, Matrix)):
+            return NotImplemented
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        if isinstance(other, Matrix):
+            # Копия плотной матрицы плюс разброс ненулевых элементов
+            data = array('d', other._row_major())
+            for i in range(self.rows):
+                base = i * self.cols
+                for j, value in zip(*self._row(i)):
+                    data[base + j] += value
+            return _by_fill(Matrix._from_flat(self.rows, self.cols, data))
+        rows = []
+        for i in range(self.rows):
+            row = self._row_dict(i)
+            for j, value in zip(*other._row(i)):
+                row[j] = row.get(j, 0.0) + value
+            rows.append(row)
+        return _by_fill(SparseMatrix._from_rows(self.rows, self.cols, rows))
+
+    __radd__ = __add__
+
+    def __mul__(self, other: Union['SparseMatrix', Matrix, Number]) -> Union['SparseMatrix', Matrix]:
+        """Умножение на скаляр, разреженную или плотную матрицу"""
+        if isinstance(other, Number):
+            if not other:
+                return SparseMatrix(self.rows, self.cols, array('q', bytes(8 * (self.rows + 1))),
+                                    array('q'), array('d'))
+            return SparseMatrix(self.rows, self.cols, array('q', self.indptr), array('q', self.indices),
+                                array('d', map(mul, self.values, repeat(other))))
+        if not isinstance(other, (SparseMatrix, Matrix)):
+            return NotImplemented
+        if self.cols != other.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second")
+        if isinstance(other, Matrix):
+            # Строка результата - сумма строк плотной матрицы с весами из строки self
+            cols = other.cols
+            dense = other._row_major()
+            data = array('d')
+            for i in range(self.rows):
+                acc = [0.0] * cols
+                for k, value in zip(*self._row(i)):
+                    acc = [x + value * y for x, y in zip(acc, dense[k * cols:(k + 1) * cols])]
+                data.extend(acc)
+            return _by_fill(Matrix._from_flat(self.rows, cols, data))
+        # Алгоритм Густавсона: строка результата накапливается в словаре
+        rows = []
+        for i in range(self.rows):
+            acc: Dict[int, float] = {}
+            for k, value in zip(*self._row(i)):
+                for j, other_value in zip(*other._row(k)):
+                    acc[j] = acc.get(j, 0.0) + value * other_value
+            rows.append(acc)
+        return _by_fill(SparseMatrix._from_rows(self.rows, other.cols, rows))
+
+    def __rmul__(self, other: Union[Matrix, Number]) -> Union['SparseMatrix', Matrix]:
+        """Умножение скаляра или плотной матрицы на разреженную"""
+        if isinstance(other, Number):
+            return self * other
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if other.cols != self.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second")
+        # Строка i результата - сумма строк self с весами из строки i плотной матрицы
+        rows = []
+        inner = other.cols
+        dense = other._row_major()
+        for i in range(other.rows):
+            acc: Dict[int, float] = {}
+            for k in range(inner):
+                factor = dense[i * inner + k]
+                if factor:
+                    for j, value in zip(*self._row(k)):
+                        acc[j] = acc.get(j, 0.0) + factor * value
+            rows.append(acc)
+        return _by_fill(SparseMatrix._from_rows(other.rows, self.cols, rows))
+
+    def determinant(self) -> float:
+        """Определитель через разреженное LU-разложение.
+
+        Ведущий элемент выбирается среди достаточно больших по модулю
+        (не меньше 0.1 от максимума в столбце) из самой короткой строки,
+        чтобы ограничить заполнение.
+        """
+        if self.rows != self.cols:
+            raise ValueError("Determinant is defined only for square matrices")
+        n = self.rows
+        active = {i: self._row_dict(i) for i in range(n)}
+        # Для каждого столбца - активные строки с ненулём в нём
+        column_rows: List[set] = [set() for _ in range(n)]
+        for i, row in active.items():
+            for j in row:
+                column_rows[j].add(i)
+        det = 1.0
+        # Строки исключаются в порядке столбцов; знак перестановки считаем по позициям
+        order = []
+        for k in range(n):
+            candidates = column_rows[k]
+            if not candidates:
+                return 0.0
+            largest = max(abs(active[i][k]) for i in candidates)
+            pivot = min((i for i in candidates if abs(active[i][k]) >= 0.1 * largest),
+                        key=lambda i: (len(active[i]), i))
+            pivot_row = active.pop(pivot)
+            for j in pivot_row:
+                column_rows[j].discard(pivot)
+            pivot_value = pivot_row[k]
+            det *= pivot_value
+            order.append(pivot)
+            for i in list(candidates):
+                row = active[i]
+                factor = row[k] / pivot_value
+                for j, value in pivot_row.items():
+                    updated = row.get(j, 0.0) - factor * value
+                    if j == k or updated == 0.0:
+                        if j in row:
+                            del row[j]
+                            column_rows[j].discard(i)
+                    else:
+                        if j not in row:
+                            column_rows[j].add(i)
+                        row[j] = updated
+        return det * _permutation_sign(order)
+
+    def __str__(self) -> str:
+        return str(self.to_dense())
+
+    def __repr__(self) -> str:
+        return f"SparseMatrix({self.rows}x{self.cols}, nnz={self.nnz})"
+
+
+def _permutation_sign(order: List[int]) -> int:
+    """Чётность перестановки через разложение на циклы"""
+    sign = 1
+    seen = [False] * len(order)
+    for start in range(len(order)):
+        if seen[start]:
+            continue
+        length = 0
+        i = start
+        while not seen[i]:
+            seen[i] = True
+            i = order[i]
+            length += 1
+        if length % 2 == 0:
+            sign = -sign
+    return sign
+
+
+def _by_fill(result: Union[SparseMatrix, Matrix]) -> Union[SparseMatrix, Matrix]:
+    """Вернуть результат в том формате, который подходит его заполненности"""
+    size = result.rows * result.cols
+    if isinstance(result, SparseMatrix):
+        return result.to_dense() if size and result.nnz > DENSE_FILL_RATIO * size else result
+    nonzero = sum(1 for value in result._data if value)
+    return SparseMatrix.from_dense(result) if nonzero <= DENSE_FILL_RATIO * size else result
+
+
+if __name__ == "__main__":
+    print("=== Разреженные матрицы ===")
+
+    s1 = SparseMatrix.from_coo(4, 4, [(0, 0, 2), (1, 1, 3), (2, 3, 1), (3, 2, 4), (0, 3, 1)])
+    s2 = SparseMatrix.from_dense([[0, 0, 0, 1], [0, 5, 0, 0], [0, 0, 0, 0], [0, 0, 6, 0]])
+    dense = Matrix([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 16]])
+
+    print("s1 =", repr(s1), s1.to_list())
+    print("s1 + s2 =", repr(s1 + s2))
+    print("s1 * s2 =", repr(s1 * s2))
+    print("s1 + dense =", repr(s1 + dense))
+    print("dense * s1 =", repr(dense * s1))
+    print("s1.transpose() =", s1.transpose().to_list())
+    print("s1.determinant() =", s1.determinant())
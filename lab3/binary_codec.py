@@ -0,0 +1,357 @@
+import datetime as dt
+import json
+import struct
+from collections import deque
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Компактный бинарный формат графа Person:
+#   сигнатура MAGIC,
+#   varint: число людей, число строк в таблице имён,
+#   таблица имён: для каждой строки varint длины и байты UTF-8,
+#   для каждого человека: varint индекса имени, метка времени, varint числа
+#   друзей и varint их номеров.
+# Люди пронумерованы подряд в порядке обхода, корень имеет номер 0.
+# Метка времени - zigzag-varint (микросекунды от EPOCH * 2 + признак часового
+# пояса), за которой для дат с поясом идёт zigzag-varint смещения в микросекундах.
+MAGIC = b'PGB\x01'
+# Потоковый вариант: сигнатура STREAM_MAGIC и куски <uint32 длина><данные>,
+# поток завершается куском нулевой длины. Кусок - varint числа новых имён,
+# сами новые имена (их номера продолжают общую таблицу) и целые записи людей.
+# Люди нумеруются при обнаружении и записываются в порядке обхода в ширину,
+# поэтому номер записи известен без хранения, а друзья могут ссылаться вперёд.
+STREAM_MAGIC = b'PGS\x01'
+CHUNK_SIZE = 64 * 1024
+EPOCH = dt.datetime(1970, 1, 1)
+FORMATS = ('json', 'binary')
+
+_MICROSECOND = dt.timedelta(microseconds=1)
+_CHUNK_HEADER = struct.Struct('<I')
+
+Record = Tuple[str, dt.datetime, List[int]]
+
+
+def check_format(format: str) -> str:
+    """Проверить имя формата для кодирования"""
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}")
+    return format
+
+
+def resolve_format(data: bytes, format: str = 'auto') -> str:
+    """Формат входных данных: явно заданный или определённый по сигнатуре"""
+    if format == 'auto':
+        return 'binary' if data[:len(MAGIC)] == MAGIC else 'json'
+    return check_format(format)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    """Знаковое число в беззнаковое: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ..."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def _write_record(out: bytearray, name_index: int, born_in: dt.datetime, friends: List[int]) -> None:
+    """Записать одного человека: индекс имени, метку времени и номера друзей"""
+    _write_varint(out, name_index)
+    _write_details(out, born_in, friends)
+
+
+def write_person(out: bytearray, name: str, born_in: dt.datetime, friends: List[int]) -> None:
+    """Записать одного человека с именем целиком (varint длины и UTF-8) вместо индекса в таблице"""
+    encoded = name.encode('utf-8')
+    _write_varint(out, len(encoded))
+    out += encoded
+    _write_details(out, born_in, friends)
+
+
+def _write_details(out: bytearray, born_in: dt.datetime, friends: List[int]) -> None:
+    if not isinstance(born_in, dt.datetime):
+        # Дата без времени - полночь, как и после разбора её ISO-строки в JSON
+        born_in = dt.datetime.combine(born_in, dt.time())
+    offset = born_in.utcoffset()
+    micros = (born_in.replace(tzinfo=None) - EPOCH) // _MICROSECOND
+    _write_varint(out, _zigzag(micros) * 2 + (offset is not None))
+    if offset is not None:
+        _write_varint(out, _zigzag(offset // _MICROSECOND))
+    _write_varint(out, len(friends))
+    for number in friends:
+        _write_varint(out, number)
+
+
+def _write_names(out: bytearray, names: List[str]) -> None:
+    """Записать таблицу имён: varint их числа, затем длина и UTF-8 каждого"""
+    _write_varint(out, len(names))
+    for name in names:
+        encoded = name.encode('utf-8')
+        _write_varint(out, len(encoded))
+        out += encoded
+
+
+def pack_objects(objects: Dict[int, Dict[str, Any]]) -> bytes:
+    """Упаковать собранные кодировщиком объекты {id(): {'name', 'born_in', 'friends'}}.
+
+    Первый объект словаря - корень; id() заменяются на плотные номера.
+    """
+    numbers = {obj_id: number for number, obj_id in enumerate(objects)}
+    return pack_records([(obj_data['name'], obj_data['born_in'], [numbers[friend_id] for friend_id in obj_data['friends']])
+                         for obj_data in objects.values()])
+
+
+def pack_records(records: List[Record]) -> bytes:
+    """Упаковать записи (имя, дата рождения, номера друзей); корень - первая, обратно к unpack_records"""
+    names: Dict[str, int] = {}
+    body = bytearray()
+    for name, born_in, friends in records:
+        _write_record(body, names.setdefault(name, len(names)), born_in, friends)
+
+    out = bytearray(MAGIC)
+    _write_varint(out, len(records))
+    _write_names(out, list(names))
+    out += body
+    return bytes(out)
+
+
+def encode_records(records: List[Record], format: str = 'json') -> bytes:
+    """Закодировать пронумерованные записи (корень - первая) в JSON или бинарный формат"""
+    check_format(format)
+    if format == 'binary':
+        return pack_records(records)
+    # Ключи объектов - номера записей, корень - 0
+    data = {
+        'objects': {number: {'name': name, 'born_in': born_in, 'friends': friends}
+                    for number, (name, born_in, friends) in enumerate(records)},
+        'root_id': 0
+    }
+    return json.dumps(data, indent=2, default=lambda value: value.isoformat()).encode('utf-8')
+
+
+class _Reader:
+    """Последовательное чтение varint и байтовых строк из буфера"""
+
+    __slots__ = ('data', 'pos')
+
+    def __init__(self, data: bytes, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+
+    def varint(self) -> int:
+        data = self.data
+        byte = data[self.pos]
+        self.pos += 1
+        if byte < 0x80:
+            return byte
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def take(self, length: int) -> bytes:
+        chunk = self.data[self.pos:self.pos + length]
+        if len(chunk) != length:
+            raise IndexError("read past the end of data")
+        self.pos += length
+        return chunk
+
+
+def _read_varints(data: bytes) -> List[int]:
+    """Разобрать поток varint целиком одним проходом по байтам"""
+    values = []
+    append = values.append
+    value = shift = 0
+    for byte in data:
+        if byte < 0x80:
+            append(value | byte << shift)
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    if shift:
+        raise ValueError("Truncated binary Person graph")
+    return values
+
+
+def _read_names(reader: _Reader) -> List[str]:
+    try:
+        return [reader.take(reader.varint()).decode('utf-8') for _ in range(reader.varint())]
+    except IndexError:
+        raise ValueError("Truncated binary Person graph") from None
+
+
+def _born_in(stamp: int, offset: Optional[int]) -> dt.datetime:
+    """Дата рождения из метки времени и смещения пояса в микросекундах"""
+    born_in = EPOCH + _unzigzag(stamp >> 1) * _MICROSECOND
+    if offset is not None:
+        born_in = born_in.replace(tzinfo=dt.timezone(offset * _MICROSECOND))
+    return born_in
+
+
+def read_person(data: bytes, pos: int) -> Record:
+    """Прочитать одного человека, записанного write_person, начиная с позиции pos"""
+    reader = _Reader(data, pos)
+    try:
+        name = reader.take(reader.varint()).decode('utf-8')
+        stamp = reader.varint()
+        born_in = _born_in(stamp, _unzigzag(reader.varint()) if stamp & 1 else None)
+        return name, born_in, [reader.varint() for _ in range(reader.varint())]
+    except IndexError:
+        raise ValueError("Truncated Person record") from None
+
+
+def _parse_records(values: List[int], names: List[str],
+                   dates: Dict[Tuple[int, Optional[int]], dt.datetime]) -> Iterator[Record]:
+    """Записи людей из разобранных varint; dates - кэш одинаковых дат между вызовами"""
+    values = iter(values)
+    varint = values.__next__
+    try:
+        for name_index in values:
+            name = names[name_index]
+            stamp = varint()
+            offset = _unzigzag(varint()) if stamp & 1 else None
+            # Одинаковые даты (а у людей их обычно немного) разбираются один раз
+            born_in = dates.get((stamp, offset))
+            if born_in is None:
+                born_in = dates[stamp, offset] = _born_in(stamp, offset)
+            friend_count = varint()
+            friends = list(islice(values, friend_count))
+            if len(friends) != friend_count:
+                raise ValueError("Truncated binary Person graph")
+            yield name, born_in, friends
+    except (StopIteration, IndexError):
+        raise ValueError("Truncated binary Person graph") from None
+
+
+def unpack_records(data: bytes) -> List[Record]:
+    """Разобрать бинарные данные в список (имя, дата рождения, номера друзей); корень - первый"""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Data is not in the binary Person graph format")
+    reader = _Reader(data, len(MAGIC))
+    try:
+        count = reader.varint()
+    except IndexError:
+        raise ValueError("Truncated binary Person graph") from None
+    names = _read_names(reader)
+
+    # После таблицы имён идут только varint: разбираем их все сразу
+    records = list(_parse_records(_read_varints(data[reader.pos:]), names, {}))
+    if len(records) < count:
+        raise ValueError("Truncated binary Person graph")
+    if len(records) > count:
+        raise ValueError("Trailing data after the Person graph")
+    return records
+
+
+def _write_chunk(stream: BinaryIO, names: List[str], body: bytearray) -> None:
+    chunk = bytearray()
+    _write_names(chunk, names)
+    chunk += body
+    stream.write(_CHUNK_HEADER.pack(len(chunk)))
+    stream.write(bytes(chunk))
+
+
+def walk_graph(root: Any, fields: Callable[[Any], Tuple[str, dt.datetime, List[Any]]]) -> Iterator[Record]:
+    """Обойти граф в ширину, нумеруя людей при обнаружении; fields(person) -> (имя, дата, друзья).
+
+    Записи (имя, дата рождения, номера друзей) отдаются по одной в порядке
+    номеров, корень - первая. В памяти держатся только очередь обхода и
+    номера уже встреченных людей.
+    """
+    numbers = {id(root): 0}
+    queue = deque([root])
+    while queue:
+        name, born_in, friends = fields(queue.popleft())
+        friend_numbers = []
+        for friend in friends:
+            number = numbers.get(id(friend))
+            if number is None:
+                number = numbers[id(friend)] = len(numbers)
+                queue.append(friend)
+            friend_numbers.append(number)
+        yield name, born_in, friend_numbers
+
+
+def dump_graph(root: Any, stream: BinaryIO, fields: Callable[[Any], Tuple[str, dt.datetime, List[Any]]],
+               chunk_size: int = CHUNK_SIZE) -> int:
+    """Записать граф в поток кусками по мере обхода; fields(person) -> (имя, дата, друзья).
+
+    В памяти держится только состояние обхода и текущий кусок, а не весь
+    закодированный граф. Возвращает число людей.
+    """
+    return dump_records(walk_graph(root, fields), stream, chunk_size)
+
+
+def dump_records(records: Iterable[Record], stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """Записать в поток уже пронумерованные записи: k-я запись - человек с номером k, корень - первая"""
+    if chunk_size <= 0:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+    stream.write(STREAM_MAGIC)
+    names: Dict[str, int] = {}
+    new_names: List[str] = []
+    body = bytearray()
+    count = 0
+    for name, born_in, friend_numbers in records:
+        count += 1
+        name_index = names.get(name)
+        if name_index is None:
+            name_index = names[name] = len(names)
+            new_names.append(name)
+        _write_record(body, name_index, born_in, friend_numbers)
+        # Куски режутся только между записями, чтобы каждый разбирался отдельно
+        if len(body) >= chunk_size:
+            _write_chunk(stream, new_names, body)
+            new_names.clear()
+            body.clear()
+    if body:
+        _write_chunk(stream, new_names, body)
+    stream.write(_CHUNK_HEADER.pack(0))
+    return count
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    """Прочитать ровно size байт (read у сокетов и каналов может вернуть меньше)"""
+    data = stream.read(size)
+    if len(data) == size:
+        return data
+    parts = [data]
+    while data:
+        size -= len(data)
+        data = stream.read(size)
+        parts.append(data)
+        if len(data) == size:
+            return b''.join(parts)
+    raise ValueError("Truncated Person graph stream")
+
+
+def load_records(stream: BinaryIO) -> Iterator[Record]:
+    """Читать записи (имя, дата рождения, номера друзей) из потока по мере прихода кусков.
+
+    Записи идут в порядке номеров, корень - первая; номера друзей могут
+    указывать на ещё не прочитанных людей.
+    """
+    if _read_exact(stream, len(STREAM_MAGIC)) != STREAM_MAGIC:
+        raise ValueError("Data is not a Person graph stream")
+    names: List[str] = []
+    dates: Dict[Tuple[int, Optional[int]], dt.datetime] = {}
+    while True:
+        (length,) = _CHUNK_HEADER.unpack(_read_exact(stream, _CHUNK_HEADER.size))
+        if not length:
+            return
+        chunk = _read_exact(stream, length)
+        reader = _Reader(chunk)
+        names.extend(_read_names(reader))
+        yield from _parse_records(_read_varints(chunk[reader.pos:]), names, dates)
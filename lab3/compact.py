@@ -0,0 +1,279 @@
+import datetime as dt
+import json
+from array import array
+from collections import deque
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+from binary_codec import CHUNK_SIZE, Record, dump_records, encode_records, resolve_format, unpack_records
+from snapshot import save_records
+
+
+class PersonArena:
+    """Общее хранилище компактных людей: вместо объекта со своим __dict__ и
+    списком друзей у каждого человека есть только номер.
+
+    Имена и даты рождения интернированы (у людей их немного разных), а дружба
+    хранится в CSR: друзья человека i - indices[indptr[i]:indptr[i + 1]].
+    add_friend дописывает новых друзей в массивы-довески отдельных строк, и
+    чтение их просто присоединяет. CSR пересобирается с довесками, только
+    когда в довесках накопилось больше связей, чем людей и связей в CSR,
+    поэтому добавление амортизированно O(1), а чтение - O(числа друзей).
+    """
+
+    __slots__ = ('_names', '_name_ids', '_name_index', '_dates', '_date_ids', '_date_index',
+                 '_indptr', '_indices', '_extra', '_extra_count', '_people')
+
+    def __init__(self) -> None:
+        self._names: List[str] = []
+        self._name_ids = array('i')
+        self._name_index: Dict[str, int] = {}
+        self._dates: List[dt.datetime] = []
+        self._date_ids = array('i')
+        self._date_index: Dict[Tuple[dt.datetime, Any], int] = {}
+        self._indptr = array('q', [0])
+        self._indices = array('i')
+        # Друзья, добавленные после сборки CSR: номер человека -> массив номеров
+        self._extra: Dict[int, array] = {}
+        self._extra_count = 0
+        # Объекты CompactPerson создаются лениво и живут, пока жива арена,
+        # чтобы один номер всегда давал один и тот же объект
+        self._people: List[Any] = []
+
+    @classmethod
+    def from_records(cls, records: Iterable[Record]) -> 'PersonArena':
+        """Собрать арену из записей (имя, дата рождения, номера друзей) сразу в CSR"""
+        arena = cls()
+        indptr, indices = arena._indptr, arena._indices
+        for name, born_in, friends in records:
+            arena._append(name, born_in)
+            indices.extend(friends)
+            indptr.append(len(indices))
+        if indices and not 0 <= min(indices) <= max(indices) < len(arena):
+            raise ValueError("Friend reference points outside of the Person graph")
+        return arena
+
+    def _append(self, name: str, born_in: dt.datetime) -> int:
+        number = len(self._name_ids)
+        name_id = self._name_index.get(name)
+        if name_id is None:
+            name_id = self._name_index[name] = len(self._names)
+            self._names.append(name)
+        self._name_ids.append(name_id)
+        # tzinfo входит в ключ: равные моменты в разных поясах - разные даты
+        date_key = (born_in, getattr(born_in, 'tzinfo', None))
+        date_id = self._date_index.get(date_key)
+        if date_id is None:
+            date_id = self._date_index[date_key] = len(self._dates)
+            self._dates.append(born_in)
+        self._date_ids.append(date_id)
+        self._people.append(None)
+        return number
+
+    def add_person(self, name: str, born_in: dt.datetime) -> 'CompactPerson':
+        return CompactPerson(name, born_in, self)
+
+    def _register(self, name: str, born_in: dt.datetime, person: 'CompactPerson') -> int:
+        number = self._append(name, born_in)
+        self._indptr.append(self._indptr[-1])
+        self._people[number] = person
+        return number
+
+    def add_friendship(self, a: int, b: int) -> None:
+        """Связать людей a и b в обе стороны, как Person.add_friend"""
+        for number in (a, b):
+            if not 0 <= number < len(self):
+                raise IndexError(f"Person number {number} is out of range for {len(self)} people")
+        extra = self._extra
+        for number, friend in ((a, b), (b, a)):
+            row = extra.get(number)
+            if row is None:
+                row = extra[number] = array('i')
+            row.append(friend)
+        self._extra_count += 2
+        if self._extra_count > len(self._indices) + len(self):
+            self._flush()
+
+    def _flush(self) -> None:
+        """Слить довески в CSR: в каждой строке старые друзья, затем новые в порядке добавления"""
+        if not self._extra:
+            return
+        indptr, indices, extra = self._indptr, self._indices, self._extra
+        new_indptr = array('q', [0])
+        new_indices = array('i')
+        for number in range(len(self)):
+            new_indices.extend(indices[indptr[number]:indptr[number + 1]])
+            row = extra.get(number)
+            if row is not None:
+                new_indices.extend(row)
+            new_indptr.append(len(new_indices))
+        self._indptr, self._indices = new_indptr, new_indices
+        self._extra = {}
+        self._extra_count = 0
+
+    def __len__(self) -> int:
+        return len(self._name_ids)
+
+    def __getitem__(self, number: int) -> 'CompactPerson':
+        person = self._people[number]
+        if person is None:
+            person = self._people[number] = CompactPerson._attach(self, number % len(self))
+        return person
+
+    def name_of(self, number: int) -> str:
+        return self._names[self._name_ids[number]]
+
+    def born_in_of(self, number: int) -> dt.datetime:
+        return self._dates[self._date_ids[number]]
+
+    def friends_of(self, number: int) -> array:
+        """Номера друзей человека: срез CSR и довесок строки, без пересборки"""
+        friends = self._indices[self._indptr[number]:self._indptr[number + 1]]
+        row = self._extra.get(number)
+        if row is not None:
+            friends.extend(row)
+        return friends
+
+    def walk(self, root: int) -> Iterator[Record]:
+        """Записи людей, достижимых из root, обходом в ширину по номерам арены.
+
+        Номера раздаются при обнаружении, как у binary_codec.walk_graph, поэтому
+        k-я запись - человек с номером k. Объекты CompactPerson не создаются.
+        """
+        names, name_ids, dates, date_ids = self._names, self._name_ids, self._dates, self._date_ids
+        numbers = array('i', [-1]) * len(self)
+        numbers[root] = 0
+        count = 1
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            friend_numbers = []
+            for friend in self.friends_of(current):
+                number = numbers[friend]
+                if number < 0:
+                    number = numbers[friend] = count
+                    count += 1
+                    queue.append(friend)
+                friend_numbers.append(number)
+            yield names[name_ids[current]], dates[date_ids[current]], friend_numbers
+
+    def records(self, root: int) -> List[Record]:
+        """Записи людей, достижимых из root, прямо по номерам арены, без объектов.
+
+        Порядок - обход в глубину, как у кодировщиков графа объектов; корень первый.
+        """
+        self._flush()
+        indptr, indices = self._indptr, self._indices
+        visited = bytearray(len(self))
+        order = []
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            if visited[current]:
+                continue
+            visited[current] = 1
+            order.append(current)
+            stack.extend(friend for friend in reversed(indices[indptr[current]:indptr[current + 1]])
+                         if not visited[friend])
+
+        renumber = array('i', [0]) * len(self)
+        for position, number in enumerate(order):
+            renumber[number] = position
+        names, name_ids, dates, date_ids = self._names, self._name_ids, self._dates, self._date_ids
+        return [(names[name_ids[number]], dates[date_ids[number]],
+                 [renumber[friend] for friend in indices[indptr[number]:indptr[number + 1]]])
+                for number in order]
+
+
+class CompactPerson:
+    """Человек в PersonArena: только ссылка на арену и номер, данные лежат в арене"""
+
+    __slots__ = ('_arena', '_index')
+
+    def __init__(self, name: str, born_in: dt.datetime, arena: PersonArena) -> None:
+        self._arena = arena
+        self._index = arena._register(name, born_in, self)
+
+    @classmethod
+    def _attach(cls, arena: PersonArena, index: int) -> 'CompactPerson':
+        person = cls.__new__(cls)
+        person._arena = arena
+        person._index = index
+        return person
+
+    def add_friend(self, friend: 'CompactPerson') -> None:
+        if friend._arena is not self._arena:
+            raise ValueError("Compact people from different arenas cannot be friends")
+        self._arena.add_friendship(self._index, friend._index)
+
+    @property
+    def arena(self) -> PersonArena:
+        return self._arena
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def name(self) -> str:
+        return self._arena.name_of(self._index)
+
+    @property
+    def born_in(self) -> dt.datetime:
+        return self._arena.born_in_of(self._index)
+
+    @property
+    def friends(self) -> List['CompactPerson']:
+        arena = self._arena
+        return [arena[number] for number in arena.friends_of(self._index)]
+
+    def __repr__(self) -> str:
+        return f"CompactPerson({self.name!r}, {self.born_in!r})"
+
+
+def encode_compact(obj: CompactPerson, format: str = 'json') -> bytes:
+    """Сериализация компактного графа прямо из арены в тот же JSON или бинарный формат"""
+    return encode_records(obj.arena.records(obj.index), format)
+
+
+def decode_compact(data: bytes, format: str = 'auto') -> CompactPerson:
+    """Десериализация сразу в PersonArena, без промежуточного графа объектов"""
+    if resolve_format(data, format) == 'binary':
+        return PersonArena.from_records(unpack_records(data))[0]
+
+    json_data = json.loads(data.decode('utf-8'))
+    objects_data = json_data['objects']
+    numbers = {obj_id: number for number, obj_id in enumerate(objects_data)}
+    dates: Dict[str, dt.datetime] = {}
+    records = []
+    for obj_data in objects_data.values():
+        born_in = dates.get(obj_data['born_in'])
+        if born_in is None:
+            born_in = dates[obj_data['born_in']] = dt.datetime.fromisoformat(obj_data['born_in'])
+        records.append((obj_data['name'], born_in, [numbers[str(friend_id)] for friend_id in obj_data['friends']]))
+    return PersonArena.from_records(records)[numbers[str(json_data['root_id'])]]
+
+
+def dump_compact(obj: CompactPerson, stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """Потоковая сериализация компактного графа обходом арены по номерам"""
+    return dump_records(obj.arena.walk(obj.index), stream, chunk_size)
+
+
+def save_compact(obj: CompactPerson, path: str) -> int:
+    """Сохранить компактный граф в файл снимка обходом арены по номерам"""
+    return save_records(obj.arena.walk(obj.index), path)
+
+
+if __name__ == "__main__":
+    arena = PersonArena()
+    p1 = arena.add_person("Ivan", dt.datetime(2020, 4, 12))
+    p2 = arena.add_person("Petr", dt.datetime(2021, 9, 27))
+    p1.add_friend(p2)
+
+    encoded = encode_compact(p1, format='binary')
+    recreated_p1 = decode_compact(encoded)
+
+    print("Компактное представление в арене:")
+    print(f"Имя: {recreated_p1.name}")
+    print(f"Друзей: {len(recreated_p1.friends)}")
+    print(f"Имя друга: {recreated_p1.friends[0].name}")
+    print(f"Людей в арене: {len(recreated_p1.arena)}")
@@ -1,6 +1,13 @@
 import datetime as dt
+import io
 import json
-from typing import Dict, List, Any, Callable
+from typing import List, Any, BinaryIO, Callable, Union
+
+from binary_codec import (CHUNK_SIZE, check_format, dump_graph, load_records, pack_objects,
+                          resolve_format, unpack_records)
+from compact import CompactPerson, decode_compact, dump_compact, encode_compact, save_compact
+from snapshot import (SNAPSHOT_CACHE_SIZE, LazyPerson, dump_lazy, encode_lazy, open_snapshot, save_lazy,
+                      save_snapshot)
 
 
 class Person:
@@ -26,38 +33,78 @@ class Person:
         return self._friends.copy()
 
 
-def encode_person_functional_private(obj: Person) -> bytes:
-    """Функциональная сериализация с соблюдением инкапсуляции"""
-
-    def collect_objects(current_obj, visited, objects):
-        obj_id = id(current_obj)
-        if obj_id in visited:
-            return
-
-        visited.add(obj_id)
-        # Используем публичный интерфейс
-        objects[obj_id] = {
-            'name': current_obj.name,
-            'born_in': current_obj.born_in.isoformat(),
-            'friends': [id(friend) for friend in current_obj.friends]
-        }
-
-        for friend in current_obj.friends:
-            collect_objects(friend, visited, objects)
+def encode_person_functional_private(obj: Union[Person, CompactPerson, LazyPerson], format: str = 'json') -> bytes:
+    """Функциональная сериализация с соблюдением инкапсуляции (format: 'json' или 'binary')"""
+    check_format(format)
+    if isinstance(obj, CompactPerson):
+        # Компактный граф кодируется прямо из арены, без обхода объектов
+        return encode_compact(obj, format)
+    if isinstance(obj, LazyPerson):
+        # Граф из снимка кодируется по номерам, а не обходом прокси по id()
+        return encode_lazy(obj, format)
+
+    def collect_objects(root, objects):
+        # Обход в глубину с явным стеком вместо рекурсии
+        stack = [root]
+        while stack:
+            current_obj = stack.pop()
+            obj_id = id(current_obj)
+            if obj_id in objects:
+                continue
+
+            # Используем публичный интерфейс; friends копирует список - берём его один раз
+            friends = current_obj.friends
+            objects[obj_id] = {
+                'name': current_obj.name,
+                'born_in': current_obj.born_in,
+                'friends': [id(friend) for friend in friends]
+            }
+
+            stack.extend(friend for friend in reversed(friends) if id(friend) not in objects)
 
-    visited = set()
     objects = {}
-    collect_objects(obj, visited, objects)
+    collect_objects(obj, objects)
 
+    if format == 'binary':
+        return pack_objects(objects)
     data = {
         'objects': objects,
         'root_id': id(obj)
     }
-    return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, indent=2, default=lambda value: value.isoformat()).encode('utf-8')
+
+
+def dump_person_functional_private(obj: Union[Person, CompactPerson, LazyPerson], stream: BinaryIO,
+                                   chunk_size: int = CHUNK_SIZE) -> int:
+    """Потоковая сериализация в двоичный файл (или sock.makefile('wb')) кусками по мере обхода"""
+    if isinstance(obj, CompactPerson):
+        return dump_compact(obj, stream, chunk_size)
+    if isinstance(obj, LazyPerson):
+        return dump_lazy(obj, stream, chunk_size)
+    # Только публичный интерфейс
+    return dump_graph(obj, stream, lambda person: (person.name, person.born_in, person.friends), chunk_size)
+
+
+def save_person_functional_private(obj: Union[Person, CompactPerson, LazyPerson], path: str) -> int:
+    """Сохранить граф в файл снимка с индексом смещений для выборочного чтения"""
+    if isinstance(obj, CompactPerson):
+        return save_compact(obj, path)
+    if isinstance(obj, LazyPerson):
+        return save_lazy(obj, path)
+    return save_snapshot(obj, path, lambda person: (person.name, person.born_in, person.friends))
+
+
+def decode_person_functional_private(data: bytes, format: str = 'auto',
+                                     compact: bool = False) -> Union[Person, CompactPerson]:
+    """Функциональная десериализация с соблюдением инкапсуляции (format 'auto' - по сигнатуре)"""
+    if compact:
+        return decode_compact(data, format)
+    if resolve_format(data, format) == 'binary':
+        records = unpack_records(data)
+        people = [Person(name, born_in) for name, born_in, _ in records]
+        _link_friends(people, [friends for _, _, friends in records])
+        return people[0]
 
-
-def decode_person_functional_private(data: bytes) -> Person:
-    """Функциональная десериализация с соблюдением инкапсуляции"""
     json_data = json.loads(data.decode('utf-8'))
     objects_data = json_data['objects']
     root_id = json_data['root_id']
@@ -70,16 +117,58 @@ def decode_person_functional_private(data: bytes) -> Person:
         objects[obj_id] = person
 
     # Устанавливаем связи через публичный метод
+    linked = set()
     for obj_id, obj_data in objects_data.items():
         person = objects[obj_id]
         for friend_id in obj_data['friends']:
-            friend = objects[str(friend_id)]
-            # Используем add_friend для правильного установления связей
-            if friend not in person.friends:  # Проверяем через публичный метод
-                person.add_friend(friend)
+            friend_id = str(friend_id)
+            # add_friend связывает обе стороны, поэтому каждую дружбу добавляем один раз:
+            # проверка по множеству пар вместо поиска в копии списка друзей
+            edge = (obj_id, friend_id) if obj_id <= friend_id else (friend_id, obj_id)
+            if edge not in linked:
+                linked.add(edge)
+                person.add_friend(objects[friend_id])
 
     return objects[str(root_id)]
 
+
+def open_person_functional_private(path: str, cache_size: int = SNAPSHOT_CACHE_SIZE) -> LazyPerson:
+    """Открыть снимок через mmap: люди разбираются при обращении, кэш ограничен cache_size"""
+    return open_snapshot(path, cache_size)
+
+
+def _link_friends(people: List[Person], friend_lists: List[List[int]]) -> None:
+    """Связать людей через add_friend по номерам друзей в порядке записей"""
+    linked = set()
+    for number, friends in enumerate(friend_lists):
+        for friend_number in friends:
+            # Как и для JSON: каждую дружбу добавляем через add_friend один раз
+            edge = (number, friend_number) if number <= friend_number else (friend_number, number)
+            if edge not in linked:
+                linked.add(edge)
+                people[number].add_friend(people[friend_number])
+
+
+def load_person_functional_private(stream: BinaryIO) -> Person:
+    """Потоковая десериализация через публичный интерфейс: люди создаются по мере чтения кусков.
+
+    Дружба связывается через add_friend, когда прочитан весь поток: так порядок
+    друзей тот же, что у decode_person_functional_private.
+    """
+    people = []
+    friend_lists = []
+    highest = -1
+    for name, born_in, friends in load_records(stream):
+        people.append(Person(name, born_in))
+        friend_lists.append(friends)
+        if friends:
+            highest = max(highest, max(friends))
+    if not people or highest >= len(people):
+        raise ValueError("Person graph stream is empty or has dangling friend references")
+    _link_friends(people, friend_lists)
+    return people[0]
+
+
 if __name__ == "__main__":
     p1 = Person("Ivan", dt.datetime(2020, 4, 12))
     p2 = Person("Petr", dt.datetime(2021, 9, 27))
@@ -93,3 +182,12 @@ if __name__ == "__main__":
     print(f"Друзей: {len(recreated_p1.friends)}")
     print(f"Имя друга: {recreated_p1.friends[0].name}")
 
+    packed = encode_person_functional_private(p1, format='binary')
+    recreated = decode_person_functional_private(packed)
+    print(f"Бинарный формат: {len(packed)} байт вместо {len(encoded)}, друг: {recreated.friends[0].name}")
+
+    stream = io.BytesIO()
+    dump_person_functional_private(p1, stream)
+    stream.seek(0)
+    recreated = load_person_functional_private(stream)
+    print(f"Потоковый формат: {len(stream.getvalue())} байт, друг: {recreated.friends[0].name}")
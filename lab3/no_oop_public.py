@@ -1,6 +1,13 @@
 import datetime as dt
+import io
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, BinaryIO, Tuple, Union
+
+from binary_codec import (CHUNK_SIZE, check_format, dump_graph, load_records, pack_objects,
+                          resolve_format, unpack_records)
+from compact import CompactPerson, decode_compact, dump_compact, encode_compact, save_compact
+from snapshot import (SNAPSHOT_CACHE_SIZE, LazyPerson, dump_lazy, encode_lazy, open_snapshot, save_lazy,
+                      save_snapshot)
 
 
 class Person:
@@ -14,38 +21,84 @@ class Person:
         friend._friends.append(self)
 
 
-def encode_person_functional_public(obj: Person) -> bytes:
-    """Функциональная сериализация с прямым доступом к данным"""
-
-    def collect_objects(current_obj, visited, objects):
-        obj_id = id(current_obj)
-        if obj_id in visited:
-            return
-
-        visited.add(obj_id)
-        # Прямой доступ к приватным атрибутам
-        objects[obj_id] = {
-            'name': current_obj._name,
-            'born_in': current_obj._born_in.isoformat(),
-            'friends': [id(friend) for friend in current_obj._friends]
-        }
+def encode_person_functional_public(obj: Union[Person, CompactPerson, LazyPerson], format: str = 'json') -> bytes:
+    """Функциональная сериализация с прямым доступом к данным (format: 'json' или 'binary')"""
+    check_format(format)
+    if isinstance(obj, CompactPerson):
+        # Компактный граф кодируется прямо из арены, без обхода объектов
+        return encode_compact(obj, format)
+    if isinstance(obj, LazyPerson):
+        # У ленивых людей из снимка нет _name/_friends: кодируем по номерам снимка
+        return encode_lazy(obj, format)
+
+    def collect_objects(root, objects):
+        # Обход в глубину с явным стеком вместо рекурсии
+        stack = [root]
+        while stack:
+            current_obj = stack.pop()
+            obj_id = id(current_obj)
+            if obj_id in objects:
+                continue
+
+            # Прямой доступ к приватным атрибутам
+            objects[obj_id] = {
+                'name': current_obj._name,
+                'born_in': current_obj._born_in,
+                'friends': [id(friend) for friend in current_obj._friends]
+            }
+
+            stack.extend(friend for friend in reversed(current_obj._friends) if id(friend) not in objects)
 
-        for friend in current_obj._friends:
-            collect_objects(friend, visited, objects)
-
-    visited = set()
     objects = {}
-    collect_objects(obj, visited, objects)
+    collect_objects(obj, objects)
 
+    if format == 'binary':
+        return pack_objects(objects)
     data = {
         'objects': objects,
         'root_id': id(obj)
     }
-    return json.dumps(data, indent=2).encode('utf-8')
-
+    return json.dumps(data, indent=2, default=lambda value: value.isoformat()).encode('utf-8')
+
+
+def dump_person_functional_public(obj: Union[Person, CompactPerson, LazyPerson], stream: BinaryIO,
+                                  chunk_size: int = CHUNK_SIZE) -> int:
+    """Потоковая сериализация в двоичный файл (или sock.makefile('wb')) кусками по мере обхода"""
+    if isinstance(obj, CompactPerson):
+        return dump_compact(obj, stream, chunk_size)
+    if isinstance(obj, LazyPerson):
+        return dump_lazy(obj, stream, chunk_size)
+    # Прямой доступ к приватным атрибутам
+    return dump_graph(obj, stream, lambda person: (person._name, person._born_in, person._friends), chunk_size)
+
+
+def save_person_functional_public(obj: Union[Person, CompactPerson, LazyPerson], path: str) -> int:
+    """Сохранить граф в файл снимка с индексом смещений для выборочного чтения"""
+    if isinstance(obj, CompactPerson):
+        return save_compact(obj, path)
+    if isinstance(obj, LazyPerson):
+        return save_lazy(obj, path)
+    # Прямой доступ к приватным атрибутам
+    return save_snapshot(obj, path, lambda person: (person._name, person._born_in, person._friends))
+
+
+def decode_person_functional_public(data: bytes, format: str = 'auto',
+                                    compact: bool = False) -> Union[Person, CompactPerson]:
+    """Функциональная десериализация с созданием объектов без конструктора (format 'auto' - по сигнатуре)"""
+    if compact:
+        return decode_compact(data, format)
+    if resolve_format(data, format) == 'binary':
+        records = unpack_records(data)
+        people = []
+        for name, born_in, _ in records:
+            person = object.__new__(Person)
+            person._name = name
+            person._born_in = born_in
+            people.append(person)
+        for person, (_, _, friends) in zip(people, records):
+            person._friends = [people[i] for i in friends]
+        return people[0]
 
-def decode_person_functional_public(data: bytes) -> Person:
-    """Функциональная десериализация с созданием объектов без конструктора"""
     json_data = json.loads(data.decode('utf-8'))
     objects_data = json_data['objects']
     root_id = json_data['root_id']
@@ -69,6 +122,33 @@ def decode_person_functional_public(data: bytes) -> Person:
     return objects[str(root_id)]
 
 
+def open_person_functional_public(path: str, cache_size: int = SNAPSHOT_CACHE_SIZE) -> LazyPerson:
+    """Открыть снимок через mmap: люди разбираются при обращении, кэш ограничен cache_size"""
+    return open_snapshot(path, cache_size)
+
+
+def load_person_functional_public(stream: BinaryIO) -> Person:
+    """Потоковая десериализация без конструктора: люди создаются по мере чтения кусков,
+    ссылки на ещё не прочитанных друзей дописываются при их появлении"""
+    people = []
+    # Номер ещё не прочитанного человека -> (кто на него ссылается, позиция в _friends)
+    pending: Dict[int, List[Tuple[Person, int]]] = {}
+    for number, (name, born_in, friends) in enumerate(load_records(stream)):
+        person = object.__new__(Person)
+        person._name = name
+        person._born_in = born_in
+        people.append(person)
+        for waiting, slot in pending.pop(number, ()):
+            waiting._friends[slot] = person
+        person._friends = [people[i] if i <= number else None for i in friends]
+        for slot, friend_number in enumerate(friends):
+            if friend_number > number:
+                pending.setdefault(friend_number, []).append((person, slot))
+    if not people or pending:
+        raise ValueError("Person graph stream is empty or has dangling friend references")
+    return people[0]
+
+
 
 if __name__ == "__main__":
     p1 = Person("Ivan", dt.datetime(2020, 4, 12))
@@ -83,3 +163,12 @@ if __name__ == "__main__":
     print(f"Друзей: {len(recreated_p1._friends)}")
     print(f"Имя друга: {recreated_p1._friends[0]._name}")
 
+    packed = encode_person_functional_public(p1, format='binary')
+    recreated = decode_person_functional_public(packed)
+    print(f"Бинарный формат: {len(packed)} байт вместо {len(encoded)}, друг: {recreated._friends[0]._name}")
+
+    stream = io.BytesIO()
+    dump_person_functional_public(p1, stream)
+    stream.seek(0)
+    recreated = load_person_functional_public(stream)
+    print(f"Потоковый формат: {len(stream.getvalue())} байт, друг: {recreated._friends[0]._name}")
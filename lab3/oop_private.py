@@ -1,6 +1,13 @@
 import datetime as dt
+import io
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, BinaryIO, Tuple, Union
+
+from binary_codec import (CHUNK_SIZE, check_format, dump_graph, load_records, pack_objects,
+                          resolve_format, unpack_records)
+from compact import CompactPerson, decode_compact, dump_compact, encode_compact, save_compact
+from snapshot import (SNAPSHOT_CACHE_SIZE, LazyPerson, dump_lazy, encode_lazy, open_snapshot, save_lazy,
+                      save_snapshot)
 
 
 class Person:
@@ -36,39 +43,77 @@ class Person:
 
 
 class PersonEncoderOOPPrivate:
-    def encode(self, obj: Person) -> bytes:
-        """Сериализация с использованием только публичных методов"""
-        visited = {}
+    def encode(self, obj: Union[Person, CompactPerson, LazyPerson], format: str = 'json') -> bytes:
+        """Сериализация с использованием только публичных методов (format: 'json' или 'binary')"""
+        check_format(format)
+        if isinstance(obj, CompactPerson):
+            # Компактный граф кодируется прямо из арены, без обхода объектов
+            return encode_compact(obj, format)
+        if isinstance(obj, LazyPerson):
+            # Граф из снимка кодируется по номерам, а не обходом прокси по id()
+            return encode_lazy(obj, format)
         objects = {}
 
-        def collect_objects(current_obj):
+        # Обход в глубину с явным стеком: глубина графа не ограничена стеком вызовов,
+        # порядок объектов тот же, что у рекурсивного обхода
+        stack = [obj]
+        while stack:
+            current_obj = stack.pop()
             obj_id = id(current_obj)
-            if obj_id in visited:
-                return
+            if obj_id in objects:
+                continue
 
-            visited[obj_id] = True
-            # Используем только публичные методы
+            # Используем только публичные методы; friends копирует список - берём его один раз
+            friends = current_obj.friends
             objects[obj_id] = {
                 'name': current_obj.name,
-                'born_in': current_obj.born_in.isoformat(),
-                'friends': [id(friend) for friend in current_obj.friends]
+                'born_in': current_obj.born_in,
+                'friends': [id(friend) for friend in friends]
             }
 
-            for friend in current_obj.friends:
-                collect_objects(friend)
-
-        collect_objects(obj)
+            stack.extend(friend for friend in reversed(friends) if id(friend) not in objects)
 
+        if format == 'binary':
+            return pack_objects(objects)
         data = {
             'objects': objects,
             'root_id': id(obj)
         }
-        return json.dumps(data, indent=2).encode('utf-8')
+        return json.dumps(data, indent=2, default=lambda value: value.isoformat()).encode('utf-8')
+
+    def dump(self, obj: Union[Person, CompactPerson, LazyPerson], stream: BinaryIO,
+             chunk_size: int = CHUNK_SIZE) -> int:
+        """Потоковая сериализация в двоичный файл (или sock.makefile('wb')) кусками по мере обхода"""
+        if isinstance(obj, CompactPerson):
+            return dump_compact(obj, stream, chunk_size)
+        if isinstance(obj, LazyPerson):
+            return dump_lazy(obj, stream, chunk_size)
+        # Только публичные свойства
+        return dump_graph(obj, stream, lambda person: (person.name, person.born_in, person.friends), chunk_size)
+
+    def save(self, obj: Union[Person, CompactPerson, LazyPerson], path: str) -> int:
+        """Сохранить граф в файл снимка с индексом смещений для выборочного чтения"""
+        if isinstance(obj, CompactPerson):
+            return save_compact(obj, path)
+        if isinstance(obj, LazyPerson):
+            return save_lazy(obj, path)
+        return save_snapshot(obj, path, lambda person: (person.name, person.born_in, person.friends))
 
 
 class PersonDecoderOOPPrivate:
-    def decode(self, data: bytes) -> Person:
-        """Десериализация с созданием объектов через конструктор"""
+    def decode(self, data: bytes, format: str = 'auto',
+               compact: bool = False) -> Union[Person, CompactPerson]:
+        """Десериализация с созданием объектов через конструктор (format 'auto' - по сигнатуре)"""
+        if compact:
+            return decode_compact(data, format)
+        if resolve_format(data, format) == 'binary':
+            records = unpack_records(data)
+            people = [Person(name, born_in) for name, born_in, _ in records]
+            for person, (_, _, friends) in zip(people, records):
+                for friend_id in friends:
+                    person._friends.append(people[friend_id])
+            return people[0]
+
         json_data = json.loads(data.decode('utf-8'))
         objects_data = json_data['objects']
         root_id = json_data['root_id']
@@ -89,6 +134,29 @@ class PersonDecoderOOPPrivate:
 
         return objects[str(root_id)]
 
+    def open(self, path: str, cache_size: int = SNAPSHOT_CACHE_SIZE) -> LazyPerson:
+        """Открыть снимок через mmap: люди разбираются при обращении, кэш ограничен cache_size"""
+        return open_snapshot(path, cache_size)
+
+    def load(self, stream: BinaryIO) -> Person:
+        """Потоковая десериализация через конструктор: люди создаются по мере чтения кусков,
+        ссылки на ещё не прочитанных друзей дописываются при их появлении"""
+        people = []
+        # Номер ещё не прочитанного человека -> (кто на него ссылается, позиция в _friends)
+        pending: Dict[int, List[Tuple[Person, int]]] = {}
+        for number, (name, born_in, friends) in enumerate(load_records(stream)):
+            person = Person(name, born_in)
+            people.append(person)
+            for waiting, slot in pending.pop(number, ()):
+                waiting._friends[slot] = person
+            person._friends = [people[i] if i <= number else None for i in friends]
+            for slot, friend_number in enumerate(friends):
+                if friend_number > number:
+                    pending.setdefault(friend_number, []).append((person, slot))
+        if not people or pending:
+            raise ValueError("Person graph stream is empty or has dangling friend references")
+        return people[0]
+
 
 
 if __name__ == "__main__":
@@ -107,3 +175,12 @@ if __name__ == "__main__":
     print(f"Друзей: {len(recreated_p1.friends)}")
     print(f"Имя друга: {recreated_p1.friends[0].name}")
 
+    packed = encoder.encode(p1, format='binary')
+    recreated = decoder.decode(packed)
+    print(f"Бинарный формат: {len(packed)} байт вместо {len(encoded)}, друг: {recreated.friends[0].name}")
+
+    stream = io.BytesIO()
+    encoder.dump(p1, stream)
+    stream.seek(0)
+    recreated = decoder.load(stream)
+    print(f"Потоковый формат: {len(stream.getvalue())} байт, друг: {recreated.friends[0].name}")
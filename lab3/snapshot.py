@@ -0,0 +1,227 @@
+import datetime as dt
+import mmap
+import struct
+import weakref
+from collections import OrderedDict, deque
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Tuple
+
+from binary_codec import (CHUNK_SIZE, Record, dump_records, encode_records, read_person, walk_graph,
+                          write_person)
+
+# Снимок графа для выборочного чтения:
+#   заголовок _HEADER: сигнатура SNAPSHOT_MAGIC, версия, число людей и смещение индекса,
+#   записи людей подряд (write_person: имя целиком, дата рождения, номера друзей),
+#   индекс: для каждого номера uint64 little-endian смещение его записи.
+# Люди нумеруются обходом в ширину, корень имеет номер 0. Открытие снимка
+# читает только заголовок, а запись человека разбирается при первом обращении.
+SNAPSHOT_MAGIC = b'PGSN'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_CACHE_SIZE = 4096
+
+_HEADER = struct.Struct('<4sB3xQQ')
+_OFFSET = struct.Struct('<Q')
+# Сколько байт записей копить перед записью в файл
+_WRITE_BUFFER = 1 << 20
+
+
+def save_snapshot(root: Any, path: str, fields: Callable[[Any], Tuple[str, dt.datetime, List[Any]]]) -> int:
+    """Записать граф в файл снимка по мере обхода; fields(person) -> (имя, дата, друзья).
+
+    Возвращает число людей.
+    """
+    return save_records(walk_graph(root, fields), path)
+
+
+def save_records(records: Iterable[Record], path: str) -> int:
+    """Записать в файл снимка уже пронумерованные записи: k-я запись - человек с номером k"""
+    offsets = bytearray()
+    with open(path, 'wb') as file:
+        file.write(bytes(_HEADER.size))
+        position = _HEADER.size
+        buffer = bytearray()
+        for name, born_in, friends in records:
+            offsets += _OFFSET.pack(position + len(buffer))
+            write_person(buffer, name, born_in, friends)
+            if len(buffer) >= _WRITE_BUFFER:
+                file.write(buffer)
+                position += len(buffer)
+                buffer.clear()
+        file.write(buffer)
+        position += len(buffer)
+        count = len(offsets) // _OFFSET.size
+        file.write(offsets)
+        file.seek(0)
+        file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, count, position))
+    return count
+
+
+class Snapshot:
+    """Снимок графа, отображённый в память через mmap.
+
+    Люди отдаются как LazyPerson; разобранные записи хранятся в LRU-кэше
+    не более чем cache_size штук, остальные читаются из файла заново.
+    """
+
+    def __init__(self, path: str, cache_size: int = SNAPSHOT_CACHE_SIZE) -> None:
+        if cache_size <= 0:
+            raise ValueError(f"Cache size must be positive, got {cache_size}")
+        with open(path, 'rb') as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"File {path!r} is not a Person graph snapshot") from None
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"File {path!r} is not a Person graph snapshot")
+        magic, version, self._count, self._index = _HEADER.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or \
+                self._index + self._count * _OFFSET.size != len(self._map) or not self._count:
+            self._map.close()
+            raise ValueError(f"File {path!r} is not a Person graph snapshot")
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[int, Record]' = OrderedDict()
+        # Один номер - один прокси, пока на него есть ссылки: id() постоянен, пока
+        # обход держит прокси. Слабые ссылки не копят всех когда-либо открытых людей,
+        # поэтому encode/dump/save обходят снимок по номерам (walk), а не по id()
+        self._people: 'weakref.WeakValueDictionary[int, LazyPerson]' = weakref.WeakValueDictionary()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._cache.clear()
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def root(self) -> 'LazyPerson':
+        return self[0]
+
+    def __getitem__(self, number: int) -> 'LazyPerson':
+        if not 0 <= number < self._count:
+            raise IndexError(f"Person number {number} is out of range for {self._count} people")
+        person = self._people.get(number)
+        if person is None:
+            person = self._people[number] = LazyPerson(self, number)
+        return person
+
+    def record(self, number: int) -> Record:
+        """Запись (имя, дата рождения, номера друзей): из кэша или разбором из файла"""
+        cache = self._cache
+        record = cache.get(number)
+        if record is not None:
+            cache.move_to_end(number)
+            return record
+        (offset,) = _OFFSET.unpack_from(self._map, self._index + number * _OFFSET.size)
+        if not _HEADER.size <= offset < self._index:
+            raise ValueError(f"Corrupted snapshot index entry for person {number}")
+        record = read_person(self._map, offset)
+        cache[number] = record
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return record
+
+    def walk(self, root: int) -> Iterator[Record]:
+        """Записи людей, достижимых из root, обходом в ширину по номерам снимка.
+
+        Номера раздаются при обнаружении, как у binary_codec.walk_graph, поэтому
+        k-я запись - человек с номером k. Объекты LazyPerson не создаются.
+        """
+        numbers = {root: 0}
+        queue = deque([root])
+        while queue:
+            name, born_in, friends = self.record(queue.popleft())
+            friend_numbers = []
+            for friend in friends:
+                number = numbers.get(friend)
+                if number is None:
+                    number = numbers[friend] = len(numbers)
+                    queue.append(friend)
+                friend_numbers.append(number)
+            yield name, born_in, friend_numbers
+
+
+class LazyPerson:
+    """Человек из снимка: имя, дата и друзья разбираются из файла при обращении"""
+
+    __slots__ = ('_snapshot', '_index', '__weakref__')
+
+    def __init__(self, snapshot: Snapshot, index: int) -> None:
+        self._snapshot = snapshot
+        self._index = index
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def name(self) -> str:
+        return self._snapshot.record(self._index)[0]
+
+    @property
+    def born_in(self) -> dt.datetime:
+        return self._snapshot.record(self._index)[1]
+
+    @property
+    def friends(self) -> List['LazyPerson']:
+        snapshot = self._snapshot
+        return [snapshot[number] for number in snapshot.record(self._index)[2]]
+
+    def add_friend(self, friend: 'LazyPerson') -> None:
+        raise TypeError("People loaded from a snapshot are read-only")
+
+    def __repr__(self) -> str:
+        return f"LazyPerson({self._index} in snapshot)"
+
+
+def open_snapshot(path: str, cache_size: int = SNAPSHOT_CACHE_SIZE) -> LazyPerson:
+    """Открыть снимок и вернуть корень; снимок остаётся открытым, пока на него есть ссылки"""
+    return Snapshot(path, cache_size).root
+
+
+def encode_lazy(obj: LazyPerson, format: str = 'json') -> bytes:
+    """Сериализация графа из снимка обходом по номерам в тот же JSON или бинарный формат"""
+    return encode_records(list(obj.snapshot.walk(obj.index)), format)
+
+
+def save_lazy(obj: LazyPerson, path: str) -> int:
+    """Сохранить граф из снимка в новый файл снимка обходом по номерам"""
+    return save_records(obj.snapshot.walk(obj.index), path)
+
+
+def dump_lazy(obj: LazyPerson, stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """Потоковая сериализация графа из снимка обходом по номерам"""
+    return dump_records(obj.snapshot.walk(obj.index), stream, chunk_size)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from compact import PersonArena
+
+    arena = PersonArena()
+    p1 = arena.add_person("Ivan", dt.datetime(2020, 4, 12))
+    p2 = arena.add_person("Petr", dt.datetime(2021, 9, 27))
+    p1.add_friend(p2)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'people.snapshot')
+        save_snapshot(p1, path, lambda person: (person.name, person.born_in, person.friends))
+
+        with Snapshot(path, cache_size=1) as snapshot:
+            recreated_p1 = snapshot.root
+            print("Ленивая загрузка снимка:")
+            print(f"Людей в снимке: {len(snapshot)}")
+            print(f"Имя: {recreated_p1.name}")
+            print(f"Имя друга: {recreated_p1.friends[0].name}")
+            print(f"Записей в кэше: {len(snapshot._cache)}")